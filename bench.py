@@ -2,11 +2,21 @@
 Benchmark: Matcha vs Regex performance comparison.
 
 Run with: python bench.py
+
+Set MATCHA_PYPERF=1 to run the same cases through pyperf (if installed)
+for more rigorous, multi-process measurements.
 """
 
+import os
 import re
-import time
-from matcha import match, find, find_all
+import timeit
+import matcha
+from matcha import _jit, _runtime
+
+try:
+    import pyperf
+except ImportError:
+    pyperf = None
 
 
 # Test data
@@ -22,130 +32,153 @@ EMAILS_TEXT = "user@domain.com " * 1000
 NUMBERS_TEXT = "abc123def456ghi789 " * 1000
 
 
-def benchmark(name: str, func, iterations: int = 100):
-    """Run a benchmark and return timing."""
-    start = time.perf_counter()
-    for _ in range(iterations):
+def warm_up(func):
+    """
+    Call func until one-off costs are paid, so they are not timed.
+    
+    That covers pattern compilation and caches, and with MATCHA_JIT=1 the
+    re-selection (and C build) once a pattern reaches the JIT threshold.
+    """
+    for _ in range(_jit.JIT_THRESHOLD if _jit.ENABLED else 3):
         func()
-    elapsed = time.perf_counter() - start
-    avg_ms = (elapsed / iterations) * 1000
+
+
+def benchmark(name: str, func):
+    """Run a benchmark and return the steady-state time per call in ms."""
+    warm_up(func)
+    
+    count, elapsed = timeit.Timer(func).autorange()
+    avg_ms = (elapsed / count) * 1000
     return avg_ms
 
 
-def run_benchmarks():
-    print("=" * 70)
-    print("MATCHA vs REGEX BENCHMARK")
-    print("=" * 70)
-    print()
+def build_cases():
+    """
+    Build the benchmark cases.
     
-    results = []
+    Returns:
+        List of (title, name, regex_func, matcha_func, pattern) tuples,
+        where pattern is the CompiledPattern matcha_func runs.
+    """
+    cases = []
     
     # ===== EMAIL MATCHING =====
-    print("1. EMAIL MATCHING (full string match)")
-    print("-" * 50)
-    
     email = "example@domain.com"
-    
-    # Regex pattern
     regex_email = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+$')
-    
-    # Matcha pattern
-    matcha_email = "[anum:a-zA-Z0-9._%+-:]@[anum:a-zA-Z0-9.-:]"
-    
-    regex_time = benchmark("Regex", lambda: regex_email.match(email))
-    matcha_time = benchmark("Matcha", lambda: match(matcha_email, email))
-    
-    print(f"  Regex:  {regex_time:.4f} ms/iter")
-    print(f"  Matcha: {matcha_time:.4f} ms/iter")
-    print(f"  Ratio:  Matcha is {matcha_time/regex_time:.1f}x slower")
-    results.append(("Email Match", regex_time, matcha_time))
-    print()
+    matcha_email = matcha.compile("[anum:a-zA-Z0-9._%+-:]@[anum:a-zA-Z0-9.-:]")
+    cases.append((
+        "1. EMAIL MATCHING (full string match)", "Email Match",
+        lambda: regex_email.match(email),
+        lambda: matcha_email.match(email),
+        matcha_email,
+    ))
     
     # ===== FIND ALL EMAILS =====
-    print("2. FIND ALL EMAILS (in 1000 emails text)")
-    print("-" * 50)
-    
     regex_find_email = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+')
-    matcha_find_email = "[anum:a-zA-Z0-9._%+-:]@[anum:a-zA-Z0-9.-:]"
-    
-    regex_time = benchmark("Regex", lambda: regex_find_email.findall(EMAILS_TEXT), iterations=10)
-    matcha_time = benchmark("Matcha", lambda: find_all(matcha_find_email, EMAILS_TEXT), iterations=10)
-    
-    print(f"  Regex:  {regex_time:.4f} ms/iter")
-    print(f"  Matcha: {matcha_time:.4f} ms/iter")
-    print(f"  Ratio:  Matcha is {matcha_time/regex_time:.1f}x slower")
-    results.append(("Find All Emails", regex_time, matcha_time))
-    print()
+    matcha_find_email = matcha.compile("[anum:a-zA-Z0-9._%+-:]@[anum:a-zA-Z0-9.-:]")
+    cases.append((
+        "2. FIND ALL EMAILS (in 1000 emails text)", "Find All Emails",
+        lambda: regex_find_email.findall(EMAILS_TEXT),
+        lambda: matcha_find_email.find_all(EMAILS_TEXT),
+        matcha_find_email,
+    ))
     
     # ===== FIND ALL NUMBERS =====
-    print("3. FIND ALL NUMBERS (in 1000 number groups)")
-    print("-" * 50)
-    
     regex_nums = re.compile(r'[0-9]+')
-    matcha_nums = "[dec::]"
-    
-    regex_time = benchmark("Regex", lambda: regex_nums.findall(NUMBERS_TEXT), iterations=10)
-    matcha_time = benchmark("Matcha", lambda: find_all(matcha_nums, NUMBERS_TEXT), iterations=10)
-    
-    print(f"  Regex:  {regex_time:.4f} ms/iter")
-    print(f"  Matcha: {matcha_time:.4f} ms/iter")
-    print(f"  Ratio:  Matcha is {matcha_time/regex_time:.1f}x slower")
-    results.append(("Find All Numbers", regex_time, matcha_time))
-    print()
+    matcha_nums = matcha.compile("[dec::]")
+    cases.append((
+        "3. FIND ALL NUMBERS (in 1000 number groups)", "Find All Numbers",
+        lambda: regex_nums.findall(NUMBERS_TEXT),
+        lambda: matcha_nums.find_all(NUMBERS_TEXT),
+        matcha_nums,
+    ))
     
     # ===== PHONE NUMBER PATTERN =====
-    print("4. PHONE NUMBER MATCH (###-###-####)")
-    print("-" * 50)
-    
     phone = "123-456-7890"
-    
     regex_phone = re.compile(r'^\d{3}-\d{3}-\d{4}$')
-    matcha_phone = "[dec::3]-[dec::3]-[dec::4]"
-    
-    regex_time = benchmark("Regex", lambda: regex_phone.match(phone))
-    matcha_time = benchmark("Matcha", lambda: match(matcha_phone, phone))
-    
-    print(f"  Regex:  {regex_time:.4f} ms/iter")
-    print(f"  Matcha: {matcha_time:.4f} ms/iter")
-    print(f"  Ratio:  Matcha is {matcha_time/regex_time:.1f}x slower")
-    results.append(("Phone Match", regex_time, matcha_time))
-    print()
+    matcha_phone = matcha.compile("[dec::3]-[dec::3]-[dec::4]")
+    cases.append((
+        "4. PHONE NUMBER MATCH (###-###-####)", "Phone Match",
+        lambda: regex_phone.match(phone),
+        lambda: matcha_phone.match(phone),
+        matcha_phone,
+    ))
     
     # ===== HEX COLOR CODE =====
-    print("5. HEX COLOR MATCH (#RRGGBB)")
-    print("-" * 50)
-    
     color = "#ff00aa"
-    
     regex_hex = re.compile(r'^#[0-9a-fA-F]{6}$')
-    matcha_hex = "#[hex::6]"
+    matcha_hex = matcha.compile("#[hex::6]")
+    cases.append((
+        "5. HEX COLOR MATCH (#RRGGBB)", "Hex Color Match",
+        lambda: regex_hex.match(color),
+        lambda: matcha_hex.match(color),
+        matcha_hex,
+    ))
+    
+    return cases
+
+
+def engine_name(pattern) -> str:
+    """Name of the backend a compiled pattern runs on, with its DFA loops."""
+    name = pattern.engine.name
+    if name == "dfa":
+        loops = _runtime.load()
+        name += f" ({loops.name if loops is not None else 'python'})"
+    return name
+
+
+def run_benchmarks():
+    print("=" * 70)
+    print("MATCHA vs REGEX BENCHMARK")
+    print("=" * 70)
+    print()
     
-    regex_time = benchmark("Regex", lambda: regex_hex.match(color))
-    matcha_time = benchmark("Matcha", lambda: match(matcha_hex, color))
+    results = []
     
-    print(f"  Regex:  {regex_time:.4f} ms/iter")
-    print(f"  Matcha: {matcha_time:.4f} ms/iter")
-    print(f"  Ratio:  Matcha is {matcha_time/regex_time:.1f}x slower")
-    results.append(("Hex Color Match", regex_time, matcha_time))
-    print()
+    for title, name, regex_func, matcha_func, pattern in build_cases():
+        print(title)
+        print("-" * 50)
+        
+        regex_time = benchmark("Regex", regex_func)
+        matcha_time = benchmark("Matcha", matcha_func)
+        
+        print(f"  Regex:  {regex_time:.4f} ms/iter")
+        print(f"  Matcha: {matcha_time:.4f} ms/iter")
+        print(f"  Ratio:  Matcha is {matcha_time/regex_time:.1f}x slower")
+        engine = engine_name(pattern)
+        print(f"  Engine: {engine}")
+        results.append((name, regex_time, matcha_time, engine))
+        print()
     
     # ===== SUMMARY =====
     print("=" * 70)
     print("SUMMARY")
     print("=" * 70)
     print()
-    print(f"{'Test':<20} {'Regex (ms)':<12} {'Matcha (ms)':<12} {'Ratio':<10}")
-    print("-" * 54)
+    print(f"{'Test':<20} {'Regex (ms)':<12} {'Matcha (ms)':<12} {'Ratio':<10} {'Engine'}")
+    print("-" * 70)
     
-    for name, regex_t, matcha_t in results:
-        ratio = matcha_t / regex_t
-        print(f"{name:<20} {regex_t:<12.4f} {matcha_t:<12.4f} {ratio:<10.1f}x")
+    for name, regex_t, matcha_t, engine in results:
+        ratio = f"{matcha_t / regex_t:.1f}x"
+        print(f"{name:<20} {regex_t:<12.4f} {matcha_t:<12.4f} {ratio:<10} {engine}")
     
     print()
-    print("Note: Matcha is a pure Python implementation focused on readability,")
-    print("      while regex is a highly optimized C implementation.")
-    print("      For most use cases, the performance difference is negligible.")
+    print("Note: the Engine column is the Matcha backend each case ran on. Its")
+    print("      speed depends on which optional accelerators are installed")
+    print("      (Cython extension, numba, NumPy, the opt-in cffi JIT).")
+
+
+def run_pyperf():
+    """Run the benchmark cases through pyperf."""
+    runner = pyperf.Runner()
+    for _, name, regex_func, matcha_func, _ in build_cases():
+        runner.bench_func(f"{name} (regex)", regex_func)
+        warm_up(matcha_func)
+        runner.bench_func(f"{name} (matcha)", matcha_func)
 
 
 if __name__ == "__main__":
-    run_benchmarks()
+    if pyperf is not None and os.environ.get("MATCHA_PYPERF"):
+        run_pyperf()
+    else:
+        run_benchmarks()
@@ -124,7 +124,11 @@ def main():
     all_urls = find_all(simple_url_pattern, TEXT)
 
     # Filter to show only root domains (no path already captured)
-    root_only = [u for u in all_urls if u not in [url.split('/')[0] + '//' + url.split('/')[2] for url in urls]]
+    with_path = set()
+    for url in urls:
+        scheme, _, host = url.split('/', 3)[:3]
+        with_path.add(scheme + '//' + host)
+    root_only = [u for u in all_urls if u not in with_path]
     if root_only:
         print(f"Root domains only: {root_only}")
 
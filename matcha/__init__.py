@@ -14,11 +14,15 @@ Example usage:
 
     # Find all matches
     find_all("[dec::]", "abc123def456")  # ["123", "456"]
+
+    # Compile once, reuse many times
+    pattern = compile("[dec::]")
+    pattern.find_all("abc123def456")  # ["123", "456"]
 """
 
-from matcha.matcher import match, find, find_all
+from matcha.matcher import match, find, find_all, compile, purge, CompiledPattern
 from matcha.lexer import Lexer
 from matcha.parser import Parser
 
-__all__ = ["match", "find", "find_all", "Lexer", "Parser"]
+__all__ = ["match", "find", "find_all", "compile", "purge", "CompiledPattern", "Lexer", "Parser"]
 __version__ = "0.1.0"
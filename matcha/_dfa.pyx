@@ -0,0 +1,143 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled DFA loops for SimpleMatch.
+
+Optional extension built by setup.py when Cython is available. The
+interfaces match run_dfa, find_first, find_all_spans and find_spans in
+matcha.dfa, which are used when this module cannot be imported. The
+scans run without the GIL.
+"""
+
+from libc.stdlib cimport free, malloc
+
+
+cdef inline Py_ssize_t _longest(const int[::1] table, const unsigned char[::1] accepts,
+                                const unsigned char[::1] data,
+                                Py_ssize_t start) noexcept nogil:
+    """End of the longest match anchored at start, or -1."""
+    cdef Py_ssize_t n = data.shape[0]
+    cdef Py_ssize_t i = start
+    cdef Py_ssize_t last = start if accepts[1] else -1
+    cdef int state = 1
+
+    while i < n:
+        state = table[state * 256 + data[i]]
+        if state == 0:
+            break
+        i += 1
+        if accepts[state]:
+            last = i
+
+    return last
+
+
+def run_dfa(const int[::1] table, const unsigned char[::1] accepts,
+            const unsigned char[::1] data, Py_ssize_t start):
+    """
+    Find the longest match anchored at `start`.
+
+    Returns:
+        End position of the longest match, or -1 if there is none.
+    """
+    cdef Py_ssize_t last
+    with nogil:
+        last = _longest(table, accepts, data, start)
+    return last
+
+
+def find_first(const int[::1] table, const unsigned char[::1] accepts,
+               const unsigned char[::1] data):
+    """
+    Find the leftmost-longest match.
+
+    Returns:
+        (start, end) of the match, or (-1, -1) if there is none.
+    """
+    cdef Py_ssize_t n = data.shape[0]
+    cdef Py_ssize_t pos = 0
+    cdef Py_ssize_t last = -1
+
+    with nogil:
+        while pos < n:
+            last = _longest(table, accepts, data, pos)
+            if last >= 0:
+                break
+            pos += 1
+
+    if last < 0:
+        return -1, -1
+    return pos, last
+
+
+def find_all_spans(const int[::1] table, const unsigned char[::1] accepts,
+                   const unsigned char[::1] data):
+    """
+    Find all non-overlapping leftmost-longest matches in latin-1 bytes.
+
+    Returns:
+        List of (start, end) tuples.
+    """
+    cdef Py_ssize_t n = data.shape[0]
+    cdef Py_ssize_t pos = 0
+    cdef Py_ssize_t last
+    spans = []
+
+    while pos < n:
+        with nogil:
+            # Skip ahead to the next start with a match
+            last = _longest(table, accepts, data, pos)
+            while last < 0 and pos + 1 < n:
+                pos += 1
+                last = _longest(table, accepts, data, pos)
+
+        if last >= 0:
+            spans.append((pos, last))
+            pos = last if last > pos else pos + 1
+        else:
+            pos += 1
+
+    return spans
+
+
+def find_spans(const int[::1] table, const unsigned char[::1] accepts,
+               const unsigned char[::1] data, Py_ssize_t lo, Py_ssize_t hi,
+               Py_ssize_t limit=-1):
+    """
+    Find the non-overlapping leftmost-longest matches starting in [lo, hi).
+
+    The whole scan runs without the GIL, so threads scanning different
+    ranges of one text run in parallel.
+
+    Returns:
+        List of (start, end) tuples, at most `limit` of them unless it
+        is negative.
+    """
+    cdef Py_ssize_t pos = lo
+    cdef Py_ssize_t count = 0
+    cdef Py_ssize_t last, i
+    cdef Py_ssize_t *found
+
+    hi = min(hi, data.shape[0])
+    if hi <= lo:
+        return []
+
+    # Each match advances pos, so there are at most hi - lo of them
+    found = <Py_ssize_t *>malloc(2 * (hi - lo) * sizeof(Py_ssize_t))
+    if found == NULL:
+        raise MemoryError()
+
+    try:
+        with nogil:
+            while pos < hi and count != limit:
+                last = _longest(table, accepts, data, pos)
+                if last >= 0:
+                    found[2 * count] = pos
+                    found[2 * count + 1] = last
+                    count += 1
+                    pos = last if last > pos else pos + 1
+                else:
+                    pos += 1
+
+        return [(found[2 * i], found[2 * i + 1]) for i in range(count)]
+    finally:
+        free(found)
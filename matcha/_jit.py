@@ -0,0 +1,251 @@
+"""
+Native code generation for hot SimpleMatch patterns.
+
+Opt-in: set MATCHA_JIT=1 in the environment. Once a compiled pattern has
+then been used JIT_THRESHOLD times, its DFA is emitted as C source with
+the transition table baked in, compiled with cffi and loaded. Builds
+happen in a private temporary directory, and only the finished module
+is kept, in a per-user cache directory capped at CACHE_SIZE modules.
+Without cffi, a working C toolchain or a safe cache directory,
+compile_dfa() returns None and matching stays on the Python path.
+"""
+
+import hashlib
+import importlib.machinery
+import importlib.util
+import os
+import shutil
+import stat
+import tempfile
+from typing import List, Optional
+
+
+# Whether hot patterns are compiled to native code at all
+ENABLED = os.environ.get("MATCHA_JIT") == "1"
+
+# Number of uses before a pattern is compiled to native code
+JIT_THRESHOLD = 1000
+
+# Directory holding compiled pattern modules
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache")),
+    "matcha",
+    "jit",
+)
+
+# Maximum number of compiled pattern modules kept in CACHE_DIR
+CACHE_SIZE = 64
+
+# Number of spans find_all_spans collects per native call
+_BATCH = 4096
+
+_CDEF = """
+int matcha_fullmatch(const char *data, long n);
+long matcha_find(const char *data, long n, long *end);
+long matcha_find_all(const char *data, long n, long *pos, long *spans, long capacity);
+"""
+
+_TEMPLATE = """
+#include <stdint.h>
+
+static const int32_t table[] = {%(table)s};
+static const unsigned char accepts[] = {%(accepts)s};
+
+static long longest(const unsigned char *in, long n, long start)
+{
+    int32_t state = 1;
+    long last = accepts[1] ? start : -1;
+    long i = start;
+
+    while (i < n) {
+        state = table[(state << 8) | in[i]];
+        if (!state)
+            break;
+        i++;
+        if (accepts[state])
+            last = i;
+    }
+    return last;
+}
+
+int matcha_fullmatch(const char *data, long n)
+{
+    const unsigned char *in = (const unsigned char *)data;
+    int32_t state = 1;
+
+    for (long i = 0; i < n; i++) {
+        state = table[(state << 8) | in[i]];
+        if (!state)
+            return 0;
+    }
+    return accepts[state];
+}
+
+long matcha_find(const char *data, long n, long *end)
+{
+    const unsigned char *in = (const unsigned char *)data;
+
+    for (long pos = 0; pos < n; pos++) {
+        long last = longest(in, n, pos);
+        if (last >= 0) {
+            *end = last;
+            return pos;
+        }
+    }
+    return -1;
+}
+
+long matcha_find_all(const char *data, long n, long *pos, long *spans, long capacity)
+{
+    const unsigned char *in = (const unsigned char *)data;
+    long count = 0;
+    long p = *pos;
+
+    while (p < n && count < capacity) {
+        long last = longest(in, n, p);
+        if (last >= 0) {
+            spans[2 * count] = p;
+            spans[2 * count + 1] = last;
+            count++;
+            p = last > p ? last : p + 1;
+        } else {
+            p++;
+        }
+    }
+    *pos = p;
+    return count;
+}
+"""
+
+
+class JitMatcher:
+    """Native DFA runner for one pattern, operating on latin-1 bytes."""
+
+    def __init__(self, module):
+        self._ffi = module.ffi
+        self._lib = module.lib
+
+    def fullmatch(self, data: bytes) -> bool:
+        """Check if the entire input is accepted."""
+        return bool(self._lib.matcha_fullmatch(data, len(data)))
+
+    def find(self, data: bytes) -> Optional[tuple[int, int]]:
+        """Return the (start, end) span of the first match, or None."""
+        end = self._ffi.new("long *")
+        start = self._lib.matcha_find(data, len(data), end)
+        return (start, end[0]) if start >= 0 else None
+
+    def find_all_spans(self, data: bytes) -> List[tuple[int, int]]:
+        """Return (start, end) spans of all non-overlapping matches."""
+        # Collect in fixed-size batches, resuming where the last one stopped
+        pos = self._ffi.new("long *")
+        buffer = self._ffi.new("long[]", 2 * _BATCH)
+        spans = []
+        while True:
+            count = self._lib.matcha_find_all(data, len(data), pos, buffer, _BATCH)
+            spans.extend((buffer[2 * i], buffer[2 * i + 1]) for i in range(count))
+            if count < _BATCH:
+                return spans
+
+
+def generate_source(dfa) -> str:
+    """Generate the C source for a DFA."""
+    return _TEMPLATE % {
+        "table": ",".join(map(str, dfa.transitions)),
+        "accepts": ",".join(map(str, dfa.accepts)),
+    }
+
+
+def _owned_privately(path: str, mode_type: int) -> bool:
+    """Check that path is of the given type, ours, and not writable by others."""
+    try:
+        info = os.lstat(path)  # A symlink is never accepted
+    except OSError:
+        return False
+
+    if stat.S_IFMT(info.st_mode) != mode_type:
+        return False
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        return False
+    return not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _cache_dir() -> Optional[str]:
+    """Create CACHE_DIR if needed; None if it is not safe to load from."""
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+    except OSError:
+        return None
+    return CACHE_DIR if _owned_privately(CACHE_DIR, stat.S_IFDIR) else None
+
+
+def _prune(cache_dir: str) -> None:
+    """Remove the least recently used modules beyond CACHE_SIZE."""
+    suffix = importlib.machinery.EXTENSION_SUFFIXES[0]
+    paths = [
+        os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+        if name.startswith("_matcha_jit_") and name.endswith(suffix)
+    ]
+    if len(paths) <= CACHE_SIZE:
+        return
+
+    paths.sort(key=os.path.getmtime, reverse=True)
+    for path in paths[CACHE_SIZE:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # Another process got there first
+
+
+def _build(ffi, path: str) -> None:
+    """Compile a cffi module in a private directory and move it to path."""
+    build_dir = tempfile.mkdtemp(prefix="matcha-jit-")
+    try:
+        # os.replace is atomic, so concurrent builds never expose a partial file
+        os.replace(ffi.compile(tmpdir=build_dir), path)
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+
+def compile_dfa(dfa) -> Optional[JitMatcher]:
+    """
+    Compile a DFA to native code.
+
+    Returns:
+        A JitMatcher, or None if cffi, the C toolchain or a private
+        cache directory is unavailable.
+    """
+    try:
+        import cffi
+    except ImportError:
+        return None
+
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return None
+
+    source = generate_source(dfa)
+    name = "_matcha_jit_" + hashlib.sha1(source.encode("ascii")).hexdigest()[:16]
+    path = os.path.join(cache_dir, name + importlib.machinery.EXTENSION_SUFFIXES[0])
+
+    try:
+        if os.path.exists(path):
+            os.utime(path)  # Mark as recently used for _prune
+        else:
+            ffi = cffi.FFI()
+            ffi.cdef(_CDEF)
+            ffi.set_source(name, source)
+            _build(ffi, path)
+            _prune(cache_dir)
+
+        if not _owned_privately(path, stat.S_IFREG):
+            return None
+
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except Exception:
+        # Any toolchain failure just means no native code for this pattern
+        return None
+
+    return JitMatcher(module)
@@ -0,0 +1,114 @@
+"""
+Vectorized scanning for single character-class patterns.
+
+A pattern such as "[dec::]" matches runs of one character class. NumPy
+maps every input byte through a 256-entry lookup table in one pass and
+finds the run boundaries with np.diff, so Python only touches the runs
+themselves. NumPy is imported on first use; without it, available()
+is False and the selector never picks this path.
+"""
+
+from functools import lru_cache
+from typing import List, Optional
+from matcha.compiler import UNBOUNDED, Span
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """Import NumPy, or return None if it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def available() -> bool:
+    """Check if NumPy is installed, importing it the first time."""
+    return _numpy() is not None
+
+
+def class_table(bitmap: int):
+    """Build the 256-entry boolean lookup table for a class bitmap."""
+    np = _numpy()
+    return np.array([(bitmap >> c) & 1 for c in range(256)], dtype=bool)
+
+
+def all_in_class(table, data: bytes) -> bool:
+    """Check if every byte belongs to the class."""
+    np = _numpy()
+    return bool(table[np.frombuffer(data, dtype=np.uint8)].all())
+
+
+def class_runs(table, data: bytes):
+    """
+    Find the maximal runs of class bytes.
+
+    Returns:
+        (starts, ends) arrays, one entry per run.
+    """
+    np = _numpy()
+    mask = table[np.frombuffer(data, dtype=np.uint8)]
+    # Pad with False on both sides so every run has a rising and falling edge
+    edges = np.flatnonzero(np.diff(mask, prepend=False, append=False))
+    return edges[0::2], edges[1::2]
+
+
+def find_all_class(table, data: bytes, min_len: int, max_len: int) -> List[Span]:
+    """
+    Find all non-overlapping leftmost-longest matches of one class.
+
+    Args:
+        table: Lookup table from class_table().
+        data: Latin-1 encoded input.
+        min_len: Minimum run length, at least 1.
+        max_len: Maximum run length, or UNBOUNDED.
+
+    Returns:
+        List of (start, end) tuples.
+    """
+    starts, ends = class_runs(table, data)
+
+    if max_len == UNBOUNDED:
+        keep = (ends - starts) >= min_len
+        return list(zip(starts[keep].tolist(), ends[keep].tolist()))
+
+    # Longer runs split into max_len pieces, keeping a long enough tail
+    spans = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        while end - start >= min_len:
+            stop = min(start + max_len, end)
+            spans.append((start, stop))
+            start = stop
+    return spans
+
+
+def prefix_starts(tables: list, data: bytes, lo: int, hi: int) -> List[int]:
+    """
+    Find the starts in [lo, hi) where every byte of a prefix is in its class.
+
+    Args:
+        tables: One class_table() per prefix position.
+        data: Latin-1 encoded input.
+        lo, hi: Range of start positions; prefixes may extend past hi.
+    """
+    np = _numpy()
+    arr = np.frombuffer(data, dtype=np.uint8)
+    stop = min(hi, len(arr) - len(tables) + 1)
+    if stop <= lo:
+        return []
+
+    ok = tables[0][arr[lo:stop]]
+    for offset in range(1, len(tables)):
+        ok &= tables[offset][arr[lo + offset:stop + offset]]
+    return (np.flatnonzero(ok) + lo).tolist()
+
+
+def find_class(table, data: bytes, min_len: int, max_len: int) -> Optional[Span]:
+    """Return the (start, end) span of the first match, or None."""
+    starts, ends = class_runs(table, data)
+
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if end - start >= min_len:
+            return start, end if max_len == UNBOUNDED else min(start + max_len, end)
+    return None
@@ -0,0 +1,83 @@
+"""
+Compiled DFA loops for SimpleMatch.
+
+The pure-Python loops in matcha.dfa are compiled with numba when it is
+installed; the ahead-of-time Cython extension (matcha._dfa) replaces
+them when it has been built. load() imports whichever is available the
+first time a compiled loop is needed, and returns None when there is
+none, so callers use the interpreter instead. Both versions of
+find_spans run without the GIL, so threads can scan one text in parallel.
+
+The compiled loops take the table and accepts from Loops.arrays, which
+converts them once per DFA, and the latin-1 input as bytes.
+"""
+
+from functools import lru_cache
+from typing import Callable, NamedTuple, Optional
+from matcha import dfa as _dfa
+
+
+class Loops(NamedTuple):
+    """One set of compiled loops, with the interfaces of matcha.dfa."""
+    name: str                   # "cython" or "numba"
+    arrays: Callable            # DFA -> (table, accepts) for the loops below
+    run_dfa: Callable
+    find_first: Callable
+    find_all_spans: Callable
+    find_spans: Callable        # Runs without the GIL
+
+
+def _buffers(dfa):
+    """The DFA's own table and accepts, which the extension reads directly."""
+    return dfa.transitions, dfa.accepts
+
+
+def _numba_loops() -> Optional[Loops]:
+    """Compile the matcha.dfa loops with numba, or None without it."""
+    try:
+        import numba
+        import numpy as np
+    except ImportError:
+        return None
+
+    _run_dfa = numba.njit(cache=True)(_dfa.run_dfa)
+    _find_first = numba.njit(cache=True)(_dfa.find_first)
+    _find_all_spans = numba.njit(cache=True)(_dfa.find_all_spans)
+    _find_spans = numba.njit(nogil=True, cache=True)(_dfa.find_spans)
+
+    def arrays(dfa):
+        return (
+            np.frombuffer(dfa.transitions, dtype=np.int32),
+            np.frombuffer(dfa.accepts, dtype=np.uint8),
+        )
+
+    def run_dfa(table, accepts, data: bytes, start: int) -> int:
+        """Compiled matcha.dfa.run_dfa."""
+        return _run_dfa(table, accepts, np.frombuffer(data, dtype=np.uint8), start)
+
+    def find_first(table, accepts, data: bytes) -> tuple[int, int]:
+        """Compiled matcha.dfa.find_first."""
+        return _find_first(table, accepts, np.frombuffer(data, dtype=np.uint8))
+
+    def find_all_spans(table, accepts, data: bytes):
+        """Compiled matcha.dfa.find_all_spans."""
+        return _find_all_spans(table, accepts, np.frombuffer(data, dtype=np.uint8))
+
+    def find_spans(table, accepts, data: bytes, lo: int, hi: int, limit: int = -1):
+        """Compiled matcha.dfa.find_spans."""
+        return _find_spans(table, accepts, np.frombuffer(data, dtype=np.uint8), lo, hi, limit)
+
+    return Loops("numba", arrays, run_dfa, find_first, find_all_spans, find_spans)
+
+
+@lru_cache(maxsize=None)
+def load() -> Optional[Loops]:
+    """Import the compiled loops on first use; None if there are none."""
+    try:
+        from matcha import _dfa as ext
+    except ImportError:
+        return _numba_loops()
+
+    return Loops(
+        "cython", _buffers, ext.run_dfa, ext.find_first, ext.find_all_spans, ext.find_spans,
+    )
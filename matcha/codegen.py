@@ -0,0 +1,292 @@
+"""
+Code generation for SimpleMatch patterns.
+
+A pattern such as "[dec::3]-[dec::4]" has a known length and one class
+per position, so its test at a given offset can be written out as a
+single boolean expression with every bitmap inlined as an int constant.
+
+Any other pattern can be unrolled into a backtracking function for the
+Matcher: each operation becomes inline code, and each choice point a
+nested for loop over its candidate end positions, with no dispatch on
+operation type at run time.
+
+The generated functions are compiled with exec() once per pattern and
+run over latin-1 bytes.
+"""
+
+from typing import Callable, List, Optional
+from matcha.compiler import CompiledProgram, LATIN1, OP_CLASS, OP_LITERAL, UNBOUNDED, Span
+from matcha.shift_or import position_bitmaps
+from matcha.tokens import bitmap_ranges
+
+_TEMPLATE = '''
+def fullmatch(s):
+    if len(s) != {length}:
+        return False
+    i = 0
+    return bool({test})
+
+def find(s):
+    i = 0
+    last = len(s) - {length}
+    while i <= last:
+{skip}
+        if {test}:
+            return i, i + {length}
+        i += 1
+    return None
+
+def find_all_spans(s):
+    spans = []
+    append = spans.append
+    i = 0
+    last = len(s) - {length}
+    while i <= last:
+{skip}
+        if {test}:
+            append((i, i + {length}))
+            i += {length}
+        else:
+            i += 1
+    return spans
+'''
+
+# Jump to the next offset where the pattern's first literal byte lines up
+_SKIP = '''\
+        i = s.find({byte}, i + {offset}) - {offset}
+        if i < 0 or i > last:
+            break'''
+
+
+class FixedMatcher:
+    """Generated matcher for one fixed-length pattern, operating on latin-1 bytes."""
+
+    def __init__(self, source: str, length: int):
+        namespace: dict = {}
+        exec(compile(source, "<matcha>", "exec"), namespace)
+
+        self.source = source
+        self.length = length
+        self.fullmatch: Callable[[bytes], bool] = namespace["fullmatch"]
+        self.find: Callable[[bytes], Optional[Span]] = namespace["find"]
+        self.find_all_spans: Callable[[bytes], List[Span]] = namespace["find_all_spans"]
+
+
+def _position_test(offset: int, bitmap: int) -> Optional[str]:
+    """Expression testing byte s[i + offset], or None if any byte passes."""
+    index = f"s[i + {offset}]" if offset else "s[i]"
+
+    if bitmap == LATIN1:
+        return None
+    if bitmap & (bitmap - 1) == 0:
+        # A single byte: plain equality is cheaper than a shift
+        return f"{index} == {bitmap.bit_length() - 1}"
+
+    # A single range such as 0-9 is a chained comparison, which is cheaper
+    # than shifting the bitmap; with more ranges the shift wins
+    ranges = bitmap_ranges(bitmap)
+    if len(ranges) == 1:
+        lo, hi = ranges[0]
+        return f"{lo} <= {index} <= {hi}"
+    return f"({bitmap} >> {index}) & 1"
+
+
+def generate_source(positions: List[int]) -> str:
+    """Generate the source of the three matching functions."""
+    tests = [_position_test(offset, bitmap) for offset, bitmap in enumerate(positions)]
+    test = " and ".join(t for t in tests if t) or "True"
+
+    # Searches skip ahead with bytes.find when some position is a literal byte
+    skip = ""
+    for offset, bitmap in enumerate(positions):
+        if bitmap & (bitmap - 1) == 0:
+            skip = _SKIP.format(byte=bitmap.bit_length() - 1, offset=offset)
+            break
+
+    return _TEMPLATE.format(length=len(positions), test=test, skip=skip)
+
+
+def build_fixed(program: CompiledProgram) -> Optional[FixedMatcher]:
+    """
+    Generate a matcher for a fixed-length program.
+
+    Returns:
+        A FixedMatcher, or None if the program is not fixed-length, is
+        empty or too long, or uses characters outside latin-1.
+    """
+    positions = position_bitmaps(program)
+    if not positions:
+        return None
+
+    positions = [bitmap & LATIN1 for bitmap in positions]
+    if not all(positions):
+        return None  # A position no latin-1 byte can match
+
+    return FixedMatcher(generate_source(positions), len(positions))
+
+
+# Most nested choice-point loops in a generated backtracker (CPython
+# allows 20 statically nested blocks)
+MAX_CHOICE_POINTS = 16
+
+
+def _is_choice_point(program: CompiledProgram, i: int) -> bool:
+    """Check if operation i can end at more than one position."""
+    op = program.ops[i]
+    if op == OP_LITERAL:
+        return False
+    if op == OP_CLASS:
+        return program.min_lens[i] != program.max_lens[i]
+    return len(program.literals[i]) > 1
+
+
+def _offset(pos: str, k: int) -> str:
+    """Expression for pos + k."""
+    if k == 0:
+        return pos
+    return f"{pos} + {k}" if k > 0 else f"{pos} - {-k}"
+
+
+def generate_backtracker(program: CompiledProgram) -> str:
+    """
+    Generate the source of a backtracking function for a program.
+
+    The function is match(s, p, failed) and returns the end of the first
+    match of the program at position p in latin-1 bytes s, or -1. Like
+    Matcher._match_at, it tries longer class runs and earlier literal
+    alternatives first, and records choice points whose candidates all
+    fail in `failed` so they are never explored again. Accept tables
+    are referenced as T<i> and must be in the function's namespace.
+    """
+    lines = [
+        "def match(s, p, failed):",
+        "    n = len(s)",
+        "    stride = n + 1",
+    ]
+    size = len(program)
+
+    def emit(indent: int, line: str) -> None:
+        lines.append("    " * indent + line)
+
+    # Walk the operations, nesting one level deeper per choice point;
+    # `fail` is what to do when an operation cannot match
+    indent, pos, fail = 1, "p", "return -1"
+    closers = []
+
+    for i in range(size):
+        op = program.ops[i]
+        last = i == size - 1
+        end = f"p{i}"
+        key = f"{i} * stride + {pos}" if i else pos
+
+        if op == OP_LITERAL:
+            literal = program.byte_literals[i]
+            emit(indent, f"if not s.startswith({literal!r}, {pos}):")
+            emit(indent + 1, fail)
+            emit(indent, f"{end} = {_offset(pos, len(literal))}")
+
+        elif op != OP_CLASS:
+            literals = program.byte_literals[i]
+            if last:
+                # The first alternative present wins, and nothing follows
+                for literal in literals:
+                    emit(indent, f"if s.startswith({literal!r}, {pos}):")
+                    emit(indent + 1, f"return {_offset(pos, len(literal))}")
+                emit(indent, fail)
+                break
+
+            if len(literals) == 1:
+                emit(indent, f"if not s.startswith({literals[0]!r}, {pos}):")
+                emit(indent + 1, fail)
+                emit(indent, f"{end} = {_offset(pos, len(literals[0]))}")
+            else:
+                emit(indent, f"k{i} = {key}")
+                emit(indent, f"if k{i} not in failed:")
+                emit(indent + 1, f"e{i} = []")
+                for literal in literals:
+                    emit(indent + 1, f"if s.startswith({literal!r}, {pos}):")
+                    emit(indent + 2, f"e{i}.append({_offset(pos, len(literal))})")
+                emit(indent + 1, f"for {end} in e{i}:")
+                closers.append((indent, i, fail))
+                indent, fail = indent + 2, "continue"
+
+        else:
+            min_len = max(program.min_lens[i], 0)
+            max_len = program.max_lens[i]
+
+            if max_len == min_len:
+                # Fixed count: a single candidate, so no choice point
+                emit(indent, f"{end} = {_offset(pos, min_len)}")
+                emit(indent, f"if {end} > n:")
+                emit(indent + 1, fail)
+                if program.accepts[i] is not None:
+                    emit(indent, f"q{i} = {pos}")
+                    emit(indent, f"while q{i} < {end} and T{i}[s[q{i}]]:")
+                    emit(indent + 1, f"q{i} += 1")
+                    emit(indent, f"if q{i} != {end}:")
+                    emit(indent + 1, fail)
+                pos = end
+                continue
+
+            inner = indent
+            if not last:
+                emit(indent, f"k{i} = {key}")
+                emit(indent, f"if k{i} not in failed:")
+                inner += 1
+
+            # Longest run first, bounded by max_len
+            if max_len == UNBOUNDED:
+                emit(inner, f"l{i} = n")
+            else:
+                emit(inner, f"l{i} = {_offset(pos, max_len)}")
+                emit(inner, f"if l{i} > n:")
+                emit(inner + 1, f"l{i} = n")
+            if program.accepts[i] is None:
+                emit(inner, f"q{i} = l{i}")
+            else:
+                emit(inner, f"q{i} = {pos}")
+                emit(inner, f"while q{i} < l{i} and T{i}[s[q{i}]]:")
+                emit(inner + 1, f"q{i} += 1")
+
+            if last:
+                # The longest run is the first candidate, and nothing follows
+                emit(indent, f"if q{i} >= {_offset(pos, min_len)}:")
+                emit(indent + 1, f"return q{i}")
+                emit(indent, fail)
+                break
+
+            emit(inner, f"for {end} in range(q{i}, {_offset(pos, min_len - 1)}, -1):")
+            closers.append((indent, i, fail))
+            indent, fail = indent + 2, "continue"
+
+        pos = end
+    else:
+        # Every operation matched: the innermost loop body succeeds
+        emit(indent, f"return {pos}")
+
+    # After each choice-point loop runs out, remember the state as failed
+    for outer, i, outer_fail in reversed(closers):
+        emit(outer + 1, f"failed.add(k{i})")
+        emit(outer, outer_fail)
+
+    return "\n".join(lines) + "\n"
+
+
+def build_backtracker(program: CompiledProgram) -> Optional[Callable[[bytes, int, set], int]]:
+    """
+    Compile a generated backtracking function for a program.
+
+    Returns:
+        The function, or None if the program has literals outside
+        latin-1 or more than MAX_CHOICE_POINTS choice points.
+    """
+    if not program.latin1:
+        return None
+    if sum(_is_choice_point(program, i) for i in range(len(program))) > MAX_CHOICE_POINTS:
+        return None
+
+    namespace: dict = {
+        f"T{i}": accept for i, accept in enumerate(program.accepts) if accept is not None
+    }
+    exec(compile(generate_backtracker(program), "<matcha>", "exec"), namespace)
+    return namespace["match"]
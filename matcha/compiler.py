@@ -0,0 +1,146 @@
+"""
+Compiler for SimpleMatch patterns.
+
+Flattens a parsed AST into a struct-of-arrays program that the backtracking
+matcher can walk with plain index lookups instead of node attribute access.
+"""
+
+from array import array
+from typing import List, Optional, Union
+from matcha.parser import AST, LiteralNode
+
+
+# Operation codes
+OP_LITERAL = 0   # Match literal text exactly
+OP_CLASS = 1     # Match a run of characters from a bitmap class
+OP_LITERALS = 2  # Match one of several literal strings
+
+# max_lens value for an unbounded pattern
+UNBOUNDED = -1
+
+# Bitmap of the X type, which matches any character
+WILDCARD = -1
+
+# Bitmap with every latin-1 character set
+LATIN1 = (1 << 256) - 1
+
+# (start, end) offsets of a match
+Span = tuple[int, int]
+
+
+def accept_table(bitmap: int) -> Optional[bytes]:
+    """
+    Lookup table for the latin-1 part of a class bitmap.
+
+    Byte c is 1 if character chr(c) is in the class. Returns None for the
+    wildcard, which needs no test at all.
+    """
+    if bitmap == WILDCARD:
+        return None
+    return bytes((bitmap >> c) & 1 for c in range(256))
+
+
+def literal_trie(literals: List[str]) -> dict:
+    """
+    Build a trie over literal alternatives.
+
+    Each node maps a character code to its child node, so the trie walks
+    str and latin-1 bytes alike; the key None holds the indexes of the
+    literals that end at that node.
+    """
+    root: dict = {}
+    for index, literal in enumerate(literals):
+        node = root
+        for char in literal:
+            node = node.setdefault(ord(char), {})
+        node.setdefault(None, []).append(index)
+    return root
+
+
+class CompiledProgram:
+    """
+    A pattern as parallel arrays indexed by operation number.
+
+    For operation i:
+        ops[i]      - one of OP_LITERAL, OP_CLASS, OP_LITERALS
+        bitmaps[i]  - class bitmap for OP_CLASS, else None
+        accepts[i]  - accept_table() of the bitmap for OP_CLASS, else None
+        min_lens[i] - minimum run length for OP_CLASS
+        max_lens[i] - maximum run length for OP_CLASS (UNBOUNDED = no maximum)
+        literals[i] - text for OP_LITERAL, alternatives for OP_LITERALS
+        byte_literals[i] - literals[i] encoded as latin-1
+        tries[i]    - literal_trie() of the alternatives for OP_LITERALS
+
+    byte_literals is only filled in when every literal encodes; latin1 is
+    False otherwise, and the program can only run over str.
+    """
+
+    def __init__(self, ast: AST):
+        self.ops = array('b')
+        self.bitmaps: List[Optional[int]] = []
+        self.accepts: List[Optional[bytes]] = []
+        self.min_lens = array('i')
+        self.max_lens = array('i')
+        self.literals: List[Union[str, List[str], None]] = []
+        self.tries: List[Optional[dict]] = []
+
+        for node in ast:
+            self._add(node)
+
+        self.byte_literals: List[Union[bytes, List[bytes], None]] = []
+        try:
+            for value in self.literals:
+                if isinstance(value, list):
+                    value = [literal.encode('latin-1') for literal in value]
+                elif value is not None:
+                    value = value.encode('latin-1')
+                self.byte_literals.append(value)
+        except UnicodeEncodeError:
+            self.byte_literals = []
+        self.latin1 = len(self.byte_literals) == len(self.literals)
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def is_single_class(self) -> bool:
+        """Check if the program is one character class that cannot match empty."""
+        if len(self.ops) != 1 or self.ops[0] != OP_CLASS:
+            return False
+        min_len, max_len = self.min_lens[0], self.max_lens[0]
+        return min_len >= 1 and (max_len == UNBOUNDED or max_len >= min_len)
+
+    def _add(self, node) -> None:
+        """Append the operation for one AST node."""
+        if isinstance(node, LiteralNode):
+            self.ops.append(OP_LITERAL)
+            self.bitmaps.append(None)
+            self.accepts.append(None)
+            self.min_lens.append(len(node.value))
+            self.max_lens.append(len(node.value))
+            self.literals.append(node.value)
+            self.tries.append(None)
+        elif node.literals:
+            self.ops.append(OP_LITERALS)
+            self.bitmaps.append(None)
+            self.accepts.append(None)
+            self.min_lens.append(node.min_len)
+            self.max_lens.append(UNBOUNDED if node.max_len is None else node.max_len)
+            self.literals.append(node.literals)
+            self.tries.append(literal_trie(node.literals))
+        else:
+            self.ops.append(OP_CLASS)
+            self.bitmaps.append(node.bitmap)
+            self.accepts.append(accept_table(node.bitmap))
+            if node.max_len is None:
+                self.min_lens.append(node.min_len)
+                self.max_lens.append(UNBOUNDED)
+            elif node.max_len < node.min_len:
+                # Impossible bounds such as <0 (which would collide with
+                # UNBOUNDED): store a pair no run length satisfies
+                self.min_lens.append(1)
+                self.max_lens.append(0)
+            else:
+                self.min_lens.append(node.min_len)
+                self.max_lens.append(node.max_len)
+            self.literals.append(None)
+            self.tries.append(None)
@@ -0,0 +1,376 @@
+"""
+DFA construction for SimpleMatch patterns.
+
+Builds a Thompson NFA from a parsed AST and converts it into a table-driven
+DFA with subset construction, so matching costs one table lookup per character.
+"""
+
+from array import array
+from typing import List
+from matcha.compiler import LATIN1, Span
+from matcha.parser import AST, LiteralNode, PatternNode
+
+
+# Number of columns per DFA state (one per latin-1 character)
+STRIDE = 256
+
+# State 0 is the dead state, state 1 is the start state
+DEAD = 0
+START = 1
+
+# Upper bound on DFA states before giving up (subset construction can blow up)
+MAX_STATES = 1000
+
+
+class DFABuildError(Exception):
+    """Raised when a pattern cannot be compiled to a DFA."""
+    pass
+
+
+class DFA:
+    """
+    A deterministic automaton stored as a flat transition table.
+
+    The next state for `state` on byte `c` is `transitions[state * 256 + c]`;
+    state 0 is dead. Matching runs over latin-1 encoded bytes.
+    """
+
+    def __init__(self, num_states: int, transitions: array, accept_mask: int):
+        self.num_states = num_states
+        self.transitions = transitions
+        self.accept_mask = accept_mask  # Bit i set if state i is accepting
+        self.accepts = bytes((accept_mask >> i) & 1 for i in range(num_states))
+
+    def fullmatch(self, data: bytes) -> bool:
+        """Check if the entire input is accepted."""
+        table = self.transitions
+        state = START
+
+        for c in data:
+            state = table[state * STRIDE + c]
+            if not state:
+                return False
+
+        return bool((self.accept_mask >> state) & 1)
+
+    def match_at(self, data: bytes, start: int) -> int:
+        """
+        Find the longest match beginning at `start`.
+
+        Returns:
+            End position of the longest match, or -1 if there is none.
+        """
+        table = self.transitions
+        accept_mask = self.accept_mask
+        state = START
+        last = start if accept_mask & (1 << START) else -1
+
+        for pos in range(start, len(data)):
+            state = table[state * STRIDE + data[pos]]
+            if not state:
+                break
+            if (accept_mask >> state) & 1:
+                last = pos + 1
+
+        return last
+
+
+# The loops below are the pure-Python references for the compiled ones in
+# matcha._runtime. They take the flat table, the accepts bytes and the
+# latin-1 input, and are written so numba can compile them unchanged.
+
+
+def run_dfa(table, accepts, data, start: int) -> int:
+    """
+    Find the longest match anchored at `start`.
+
+    Returns:
+        End position of the longest match, or -1 if there is none.
+    """
+    n = len(data)
+    state = START
+    last = start if accepts[START] else -1
+    i = start
+
+    while i < n:
+        state = table[state * STRIDE + data[i]]
+        if state == DEAD:
+            break
+        i += 1
+        if accepts[state]:
+            last = i
+
+    return last
+
+
+def find_first(table, accepts, data) -> tuple[int, int]:
+    """
+    Find the leftmost-longest match.
+
+    Returns:
+        (start, end) of the match, or (-1, -1) if there is none.
+    """
+    n = len(data)
+
+    for pos in range(n):
+        state = START
+        last = pos if accepts[START] else -1
+        i = pos
+
+        while i < n:
+            state = table[state * STRIDE + data[i]]
+            if state == DEAD:
+                break
+            i += 1
+            if accepts[state]:
+                last = i
+
+        if last >= 0:
+            return pos, last
+
+    return -1, -1
+
+
+def find_all_spans(table, accepts, data) -> List[Span]:
+    """
+    Find all non-overlapping leftmost-longest matches in latin-1 bytes.
+
+    Returns:
+        List of (start, end) tuples.
+    """
+    n = len(data)
+    spans = []
+    pos = 0
+
+    while pos < n:
+        state = START
+        last = pos if accepts[START] else -1
+        i = pos
+
+        while i < n:
+            state = table[state * STRIDE + data[i]]
+            if state == DEAD:
+                break
+            i += 1
+            if accepts[state]:
+                last = i
+
+        if last >= 0:
+            spans.append((pos, last))
+            pos = last if last > pos else pos + 1
+        else:
+            pos += 1
+
+    return spans
+
+
+def find_spans(table, accepts, data, lo: int, hi: int,
+               limit: int = -1) -> List[Span]:
+    """
+    Find the non-overlapping leftmost-longest matches starting in [lo, hi).
+
+    Searches from lo like find_all_spans; matches may end past hi.
+
+    Returns:
+        List of (start, end) tuples, at most `limit` of them unless it
+        is negative.
+    """
+    n = len(data)
+    hi = min(hi, n)
+    spans = []
+    pos = lo
+
+    # The longest-match loop is inlined, as in find_all_spans, so numba
+    # can compile this function on its own
+    while pos < hi and len(spans) != limit:
+        state = START
+        last = pos if accepts[START] else -1
+        i = pos
+
+        while i < n:
+            state = table[state * STRIDE + data[i]]
+            if state == DEAD:
+                break
+            i += 1
+            if accepts[state]:
+                last = i
+
+        if last >= 0:
+            spans.append((pos, last))
+            pos = last if last > pos else pos + 1
+        else:
+            pos += 1
+
+    return spans
+
+
+class _NFA:
+    """Thompson NFA with bitmap-labelled edges and epsilon moves."""
+
+    def __init__(self):
+        self.edges: List[List[tuple[int, int]]] = []
+        self.epsilon: List[List[int]] = []
+
+    def new_state(self) -> int:
+        self.edges.append([])
+        self.epsilon.append([])
+        return len(self.edges) - 1
+
+    def add_chain(self, state: int, bitmaps: List[int]) -> int:
+        """Add a chain of edges, one per bitmap, and return its last state."""
+        for bitmap in bitmaps:
+            nxt = self.new_state()
+            self.edges[state].append((bitmap, nxt))
+            state = nxt
+        return state
+
+    def add_node(self, state: int, node) -> int:
+        """Add the fragment for one AST node after `state` and return its exit."""
+        if isinstance(node, LiteralNode):
+            return self.add_chain(state, [_char_bitmap(c) for c in node.value])
+
+        if node.literals:
+            # Alternation: one branch per literal string
+            end = self.new_state()
+            for literal in node.literals:
+                branch_end = self.add_chain(state, [_char_bitmap(c) for c in literal])
+                self.epsilon[branch_end].append(end)
+            return end
+
+        bitmap = _class_bitmap(node)
+
+        if max(node.min_len, node.max_len or 0) > MAX_STATES:
+            raise DFABuildError("Length constraint too large for a DFA")
+
+        if node.max_len is not None and node.max_len < node.min_len:
+            return self.new_state()  # Unreachable exit: the node can never match
+
+        # Mandatory repetitions
+        state = self.add_chain(state, [bitmap] * node.min_len)
+
+        if node.max_len is None:
+            # Unbounded: loop on a fresh state so the next node cannot share it
+            loop = self.new_state()
+            self.epsilon[state].append(loop)
+            self.edges[loop].append((bitmap, loop))
+            return loop
+
+        # Optional repetitions, each of which may be skipped
+        end = self.new_state()
+        for _ in range(node.max_len - node.min_len):
+            self.epsilon[state].append(end)
+            state = self.add_chain(state, [bitmap])
+        self.epsilon[state].append(end)
+        return end
+
+    def closure(self, states) -> frozenset:
+        """Epsilon closure of a set of states."""
+        seen = set(states)
+        stack = list(states)
+        while stack:
+            for nxt in self.epsilon[stack.pop()]:
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return frozenset(seen)
+
+
+def _char_bitmap(char: str) -> int:
+    """Bitmap with the bit for a single character set."""
+    code = ord(char)
+    if code >= STRIDE:
+        raise DFABuildError(f"Character {char!r} is outside the latin-1 range")
+    return 1 << code
+
+
+def _class_bitmap(node: PatternNode) -> int:
+    """Latin-1 part of the bitmap of a character-class node."""
+    # The DFA only ever runs over latin-1 text, so higher bits are irrelevant
+    return node.bitmap & LATIN1
+
+
+def byte_classes(bitmaps) -> List[int]:
+    """
+    Partition the latin-1 bytes into classes no bitmap distinguishes.
+
+    Every bitmap either contains a whole class or none of it, so a DFA
+    state needs one closure per class instead of one per byte.
+    """
+    classes = [LATIN1]
+    for bitmap in set(bitmaps):
+        refined = []
+        for cls in classes:
+            inside = cls & bitmap
+            if inside and inside != cls:
+                refined.append(inside)
+                refined.append(cls & ~bitmap)
+            else:
+                refined.append(cls)
+        classes = refined
+    return classes
+
+
+def _codes(bitmap: int) -> List[int]:
+    """Codes of the set bits of a non-negative bitmap."""
+    codes = []
+    while bitmap:
+        low = bitmap & -bitmap
+        codes.append(low.bit_length() - 1)
+        bitmap ^= low
+    return codes
+
+
+def build_dfa(ast: AST, max_states: int = MAX_STATES) -> DFA:
+    """
+    Compile an AST into a DFA.
+
+    Raises:
+        DFABuildError: If the pattern uses characters outside latin-1 or
+            the automaton would exceed `max_states` states.
+    """
+    nfa = _NFA()
+    state = nfa.new_state()
+    start = state
+    for node in ast:
+        state = nfa.add_node(state, node)
+    accept = state
+
+    classes = [
+        (cls, _codes(cls))
+        for cls in byte_classes(bitmap for edges in nfa.edges for bitmap, _ in edges)
+    ]
+
+    dead = frozenset()
+    start_set = nfa.closure([start])
+    sets = [dead, start_set]
+    index = {dead: DEAD, start_set: START}
+    transitions = array('i')
+    accept_mask = 0
+
+    i = 0
+    while i < len(sets):
+        current = sets[i]
+        if accept in current:
+            accept_mask |= 1 << i
+
+        edges = [edge for s in current for edge in nfa.edges[s]]
+        row = array('i', [DEAD]) * STRIDE
+        for cls, codes in classes:
+            targets = [target for bitmap, target in edges if bitmap & cls]
+            if not targets:
+                continue
+
+            nxt = nfa.closure(targets)
+            if nxt not in index:
+                if len(sets) >= max_states:
+                    raise DFABuildError(f"DFA exceeds {max_states} states")
+                index[nxt] = len(sets)
+                sets.append(nxt)
+            target = index[nxt]
+            for code in codes:
+                row[code] = target
+
+        transitions.extend(row)
+        i += 1
+
+    return DFA(len(sets), transitions, accept_mask)
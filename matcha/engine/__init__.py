@@ -0,0 +1,18 @@
+"""
+Matching backends for compiled SimpleMatch patterns.
+
+The selector inspects a compiled pattern and picks the cheapest backend
+that can run it.
+"""
+
+from matcha.engine.backends import (
+    Backend, BacktrackBackend, ClassScanBackend, CodegenBackend, DFABackend, JitBackend,
+    ShiftOrBackend,
+)
+from matcha.engine.selector import PatternProfile, profile, select
+
+__all__ = [
+    "Backend", "BacktrackBackend", "ClassScanBackend", "CodegenBackend", "DFABackend",
+    "JitBackend", "ShiftOrBackend",
+    "PatternProfile", "profile", "select",
+]
@@ -0,0 +1,225 @@
+"""
+Backends that run a compiled pattern over text.
+
+Every backend exposes the same three operations and reports matches as
+(start, end) spans, so CompiledPattern can swap them freely. Backends
+marked latin1_only take the text encoded as latin-1 bytes.
+"""
+
+from abc import ABC, abstractmethod
+from functools import cached_property
+from typing import List, Optional, Union
+from matcha import _numpy_scan, _runtime
+from matcha.codegen import FixedMatcher
+from matcha.compiler import UNBOUNDED, Span
+from matcha.dfa import DFA
+from matcha._jit import JitMatcher
+from matcha.shift_or import ShiftOr
+
+# str for the backtracking backend, latin-1 bytes for the others
+Subject = Union[str, bytes]
+
+# Shortest input worth the call overhead of a compiled DFA loop for fullmatch
+_NATIVE_MIN_LENGTH = 32
+
+
+class Backend(ABC):
+    """Interface shared by all backends."""
+
+    name = "base"
+
+    # True if the backend takes latin-1 bytes rather than str
+    latin1_only = True
+
+    @abstractmethod
+    def fullmatch(self, data: Subject) -> bool:
+        """Check if the entire input matches."""
+
+    @abstractmethod
+    def find(self, data: Subject) -> Optional[Span]:
+        """Return the span of the first match, or None."""
+
+    @abstractmethod
+    def find_all_spans(self, data: Subject) -> List[Span]:
+        """Return the spans of all non-overlapping matches."""
+
+    def __repr__(self) -> str:
+        return f"<{self.name} backend>"
+
+
+class BacktrackBackend(Backend):
+    """Backtracking over the compiled program; handles any pattern and text."""
+
+    name = "backtrack"
+    latin1_only = False
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+
+    def fullmatch(self, text: str) -> bool:
+        return self.matcher.match_full(text).matched
+
+    def find(self, text: str) -> Optional[Span]:
+        return self.matcher.find_span(text)
+
+    def find_all_spans(self, text: str) -> List[Span]:
+        return self.matcher.find_all_spans(text)
+
+
+class DFABackend(Backend):
+    """
+    Table-driven DFA, with a literal-prefix skip for searches.
+
+    Runs the compiled loops from matcha._runtime when they are available,
+    loading them on the first call that uses them.
+    """
+
+    name = "dfa"
+
+    def __init__(self, dfa: DFA, prefix: str = ""):
+        self.dfa = dfa
+        # A DFA only exists for latin-1 patterns, so the prefix always encodes
+        self.prefix = prefix.encode('latin-1')
+
+    @cached_property
+    def native(self) -> Optional[tuple]:
+        """(loops, table, accepts) for the compiled loops, or None."""
+        loops = _runtime.load()
+        if loops is None:
+            return None
+        return (loops,) + loops.arrays(self.dfa)
+
+    def fullmatch(self, data: bytes) -> bool:
+        if len(data) >= _NATIVE_MIN_LENGTH and self.native is not None:
+            loops, table, accepts = self.native
+            return loops.run_dfa(table, accepts, data, 0) == len(data)
+        return self.dfa.fullmatch(data)
+
+    def find(self, data: bytes) -> Optional[Span]:
+        if self.native is not None:
+            loops, table, accepts = self.native
+            start, end = loops.find_first(table, accepts, data)
+            return (start, end) if start >= 0 else None
+
+        match_at = self.dfa.match_at
+        prefix = self.prefix
+        start = 0
+
+        while start < len(data):
+            if prefix:
+                # Skip straight to the next place the literal prefix occurs
+                start = data.find(prefix, start)
+                if start == -1:
+                    break
+
+            end = match_at(data, start)
+            if end >= 0:
+                return start, end
+            start += 1
+
+        return None
+
+    def find_all_spans(self, data: bytes) -> List[Span]:
+        if self.native is not None:
+            # Whole search runs in compiled code (Cython or numba)
+            loops, table, accepts = self.native
+            return loops.find_all_spans(table, accepts, data)
+
+        match_at = self.dfa.match_at
+        prefix = self.prefix
+        spans = []
+        pos = 0
+
+        while pos < len(data):
+            if prefix:
+                # Skip straight to the next place the literal prefix occurs
+                pos = data.find(prefix, pos)
+                if pos == -1:
+                    break
+
+            end = match_at(data, pos)
+
+            if end >= 0:
+                spans.append((pos, end))
+                pos = end if end > pos else pos + 1  # Always make progress
+            else:
+                pos += 1
+
+        return spans
+
+
+class ClassScanBackend(Backend):
+    """NumPy run scanning for patterns that are a single character class."""
+
+    name = "numpy"
+
+    def __init__(self, bitmap: int, min_len: int, max_len: int):
+        self.table = _numpy_scan.class_table(bitmap)
+        self.min_len = min_len
+        self.max_len = max_len
+
+    def fullmatch(self, data: bytes) -> bool:
+        n = len(data)
+        if n < self.min_len or (self.max_len != UNBOUNDED and n > self.max_len):
+            return False
+        return _numpy_scan.all_in_class(self.table, data)
+
+    def find(self, data: bytes) -> Optional[Span]:
+        return _numpy_scan.find_class(self.table, data, self.min_len, self.max_len)
+
+    def find_all_spans(self, data: bytes) -> List[Span]:
+        return _numpy_scan.find_all_class(self.table, data, self.min_len, self.max_len)
+
+
+class CodegenBackend(Backend):
+    """Generated straight-line code for fixed-length patterns."""
+
+    name = "codegen"
+
+    def __init__(self, fixed: FixedMatcher):
+        self.fixed = fixed
+
+    def fullmatch(self, data: bytes) -> bool:
+        return self.fixed.fullmatch(data)
+
+    def find(self, data: bytes) -> Optional[Span]:
+        return self.fixed.find(data)
+
+    def find_all_spans(self, data: bytes) -> List[Span]:
+        return self.fixed.find_all_spans(data)
+
+
+class ShiftOrBackend(Backend):
+    """Bit-parallel matcher for fixed-length patterns."""
+
+    name = "shift-or"
+
+    def __init__(self, shift_or: ShiftOr):
+        self.shift_or = shift_or
+
+    def fullmatch(self, data: bytes) -> bool:
+        return self.shift_or.fullmatch(data)
+
+    def find(self, data: bytes) -> Optional[Span]:
+        return self.shift_or.find(data)
+
+    def find_all_spans(self, data: bytes) -> List[Span]:
+        return self.shift_or.find_all_spans(data)
+
+
+class JitBackend(Backend):
+    """Native code generated from the DFA for hot patterns."""
+
+    name = "jit"
+
+    def __init__(self, jit: JitMatcher):
+        self.jit = jit
+
+    def fullmatch(self, data: bytes) -> bool:
+        return self.jit.fullmatch(data)
+
+    def find(self, data: bytes) -> Optional[Span]:
+        return self.jit.find(data)
+
+    def find_all_spans(self, data: bytes) -> List[Span]:
+        return self.jit.find_all_spans(data)
@@ -0,0 +1,96 @@
+"""
+Engine selection for compiled SimpleMatch patterns.
+
+Picks, in order of preference:
+- NumPy run scanning for a single character class, when NumPy is installed
+- generated straight-line code for fixed-length patterns of at most 64
+  positions, or Shift-Or for those the generator declines
+- the table DFA for other patterns
+- backtracking for literal alternatives (which must be tried in the
+  order written) or patterns whose DFA would be too large
+
+Hot patterns are re-selected once to move their DFA to native code.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+from matcha import _numpy_scan
+from matcha._jit import compile_dfa
+from matcha.codegen import build_fixed
+from matcha.compiler import CompiledProgram, OP_LITERALS, UNBOUNDED
+from matcha.engine.backends import (
+    Backend, BacktrackBackend, ClassScanBackend, CodegenBackend, DFABackend, JitBackend,
+    ShiftOrBackend,
+)
+from matcha.shift_or import MAX_POSITIONS, build_shift_or
+
+
+@dataclass
+class PatternProfile:
+    """Shape of a compiled pattern, as seen by the selector."""
+    has_literals_list: bool            # Uses [type:`a`|`b`:] alternatives
+    total_max_positions: Optional[int]  # Longest possible match (None = unbounded)
+    has_unbounded_star: bool           # Some class has no maximum length
+
+
+def profile(program: CompiledProgram) -> PatternProfile:
+    """Compute the selector flags for a program."""
+    has_literals_list = False
+    has_unbounded_star = False
+    total = 0
+
+    for i, op in enumerate(program.ops):
+        if op == OP_LITERALS:
+            has_literals_list = True
+            total += max(map(len, program.literals[i]))
+        elif program.max_lens[i] == UNBOUNDED:
+            has_unbounded_star = True
+        else:
+            total += program.max_lens[i]
+
+    return PatternProfile(
+        has_literals_list=has_literals_list,
+        total_max_positions=None if has_unbounded_star else total,
+        has_unbounded_star=has_unbounded_star,
+    )
+
+
+def select(compiled, hot: bool = False) -> Backend:
+    """
+    Pick the backend for a compiled pattern.
+
+    Args:
+        compiled: The CompiledPattern to run.
+        hot: True once the pattern has been used often enough to be
+            worth compiling to native code.
+    """
+    program = compiled.matcher.program
+    prof = profile(program)
+
+    if prof.has_literals_list:
+        return BacktrackBackend(compiled.matcher)
+
+    if program.is_single_class() and _numpy_scan.available():
+        # Already vectorized, so this stays put when the pattern gets hot
+        return ClassScanBackend(program.bitmaps[0], program.min_lens[0], program.max_lens[0])
+
+    if not hot and (prof.total_max_positions or 0) <= MAX_POSITIONS:
+        fixed = build_fixed(program)
+        if fixed is not None:
+            return CodegenBackend(fixed)
+        shift_or = build_shift_or(program)
+        if shift_or is not None:
+            return ShiftOrBackend(shift_or)
+
+    dfa = compiled.matcher.dfa
+    if dfa is None:
+        return BacktrackBackend(compiled.matcher)
+
+    if hot:
+        jit = compile_dfa(dfa)
+        if jit is not None:
+            return JitBackend(jit)
+        # No toolchain: fall through to the non-hot choice
+        return select(compiled)
+
+    return DFABackend(dfa, compiled.prefix)
@@ -1,15 +1,24 @@
 """
 Lexer for SimpleMatch patterns.
 
-Tokenizes pattern strings into a stream of tokens (LITERAL and PATTERN).
+Tokenizes pattern strings into a stream of tokens (LITERAL, LITERAL_RUN and PATTERN).
 """
 
-from typing import Iterator
+import re
+from functools import lru_cache
+from typing import Iterator, Optional
 from matcha.tokens import (
-    Token, TokenType, CharType, LengthConstraint, DEFAULT_CHAR_SETS
+    Token, TokenType, CharType, LengthConstraint, DEFAULT_BITMAPS
 )
 
 
+# One part of a length constraint, e.g. ">=5" or "<3"
+_LENGTH_PART_RE = re.compile(r'(>=|<=|>|<)(\d*)')
+
+# Number of distinct type, range and length strings remembered
+_CACHE_SIZE = 128
+
+
 class LexerError(Exception):
     """Raised when the lexer encounters invalid syntax."""
     def __init__(self, message: str, position: int):
@@ -23,36 +32,69 @@ class Lexer:
     
     Example:
         lexer = Lexer("[anum::]@[str::>=2]")
-        tokens = list(lexer.tokenize())
+        tokens = lexer.tokens()
     """
     
     def __init__(self, pattern: str):
         self.pattern = pattern
         self.pos = 0
     
-    def tokenize(self) -> Iterator[Token]:
+    def tokens(self) -> list[Token]:
         """
-        Generate tokens from the pattern string.
+        Tokenize the whole pattern string in one pass.
         
-        Yields:
-            Token objects representing each part of the pattern.
+        Returns:
+            List of Token objects representing each part of the pattern.
         
         Raises:
             LexerError: If the pattern contains invalid syntax.
         """
-        while self.pos < len(self.pattern):
-            if self.pattern[self.pos] == '[':
-                yield self._parse_pattern_token()
-            elif self.pattern[self.pos] == '\\':
-                yield self._parse_escape()
+        pat = self.pattern
+        n = len(pat)
+        out: list[Token] = []
+        append = out.append
+        
+        while self.pos < n:
+            char = pat[self.pos]
+            if char == '[':
+                append(self._parse_pattern_token())
+            elif char == '\\':
+                append(self._parse_escape())
             else:
-                yield self._parse_literal()
+                append(self._parse_literal())
+        
+        return out
+    
+    def tokenize(self) -> Iterator[Token]:
+        """
+        Generate tokens from the pattern string.
+        
+        Kept for compatibility; tokens() returns the same tokens as a list.
+        """
+        return iter(self.tokens())
     
     def _parse_literal(self) -> Token:
-        """Parse a single literal character."""
-        char = self.pattern[self.pos]
-        self.pos += 1
-        return Token(token_type=TokenType.LITERAL, value=char)
+        """
+        Parse a run of literal characters up to the next '[' or backslash.
+        
+        A single character becomes a LITERAL token; longer runs become one
+        LITERAL_RUN token so they can be matched with a single startswith.
+        """
+        pat = self.pattern
+        start = self.pos
+        
+        # Jump to the next special character with C-level searches
+        end = pat.find('[', start)
+        if end == -1:
+            end = len(pat)
+        escape = pat.find('\\', start, end)
+        if escape != -1:
+            end = escape
+        
+        self.pos = end
+        if end - start == 1:
+            return Token(token_type=TokenType.LITERAL, value=pat[start])
+        return Token(token_type=TokenType.LITERAL_RUN, value=pat[start:end])
     
     def _parse_escape(self) -> Token:
         """Parse an escape sequence (e.g., \\[, \\])."""
@@ -71,208 +113,242 @@ class Lexer:
         Returns:
             A Token with parsed type, range, and length constraint.
         """
+        pat = self.pattern
         start_pos = self.pos
-        self.pos += 1  # Skip opening bracket
+        body = start_pos + 1  # Skip opening bracket
         
         # Find closing bracket
-        end = self.pattern.find(']', self.pos)
+        end = pat.find(']', body)
         if end == -1:
             raise LexerError("Unclosed pattern bracket", start_pos)
         
-        content = self.pattern[self.pos:end]
         self.pos = end + 1  # Move past closing bracket
         
-        # Parse type:range:length
-        parts = content.split(':')
-        if len(parts) != 3:
+        # Locate the two colons of type:range:length within the brackets
+        c1 = pat.find(':', body, end)
+        c2 = pat.find(':', c1 + 1, end) if c1 != -1 else -1
+        if c2 == -1 or pat.find(':', c2 + 1, end) != -1:
             raise LexerError(
-                f"Pattern must have format [type:range:length], got [{content}]",
+                f"Pattern must have format [type:range:length], got {pat[start_pos:self.pos]}",
                 start_pos
             )
         
-        type_str, range_str, length_str = parts
+        type_str = pat[body:c1]
+        range_str = pat[c1 + 1:c2]
+        length_str = pat[c2 + 1:end]
         
         # Parse type
         char_type = self._parse_char_type(type_str, start_pos)
         
         # Parse range (or use default)
-        char_set, negated, literals = self._parse_range(range_str, char_type)
+        bitmap, literals = self._parse_range(range_str, char_type)
         
         # Parse length constraint
         length_constraint = self._parse_length(length_str, start_pos)
         
         return Token(
             token_type=TokenType.PATTERN,
-            value=f"[{content}]",
+            value=pat[start_pos:self.pos],
             char_type=char_type,
-            char_set=char_set,
+            bitmap=bitmap,
             length=length_constraint,
-            negated=negated,
             literals=literals
         )
     
     def _parse_char_type(self, type_str: str, pos: int) -> CharType:
         """Parse the character type from the pattern."""
-        type_str = type_str.strip().lower()
         try:
-            return CharType(type_str)
+            return _parse_char_type(type_str)
         except ValueError:
             valid_types = [t.value for t in CharType]
             raise LexerError(
-                f"Invalid type '{type_str}'. Valid types: {valid_types}",
+                f"Invalid type '{type_str.strip().lower()}'. Valid types: {valid_types}",
                 pos
             )
     
-    def _parse_range(self, range_str: str, char_type: CharType) -> tuple[str, bool, list[str]]:
-        """
-        Parse the character range, or return default for the type.
-        
-        Supports:
-        - Empty: use default for type
-        - Range: A-Z, a-z, 0-9
-        - Alternatives: S|s, A|B|C
-        - Combined: A-Za-z
-        - X type: returns None (matches any character)
-        - NOT: !A-Z (matches anything except A-Z)
-        - Literals: `black`|`WHITE` (matches exact strings)
-        
-        Returns:
-            tuple of (char_set, negated, literals)
-        """
-        range_str = range_str.strip()
-        
-        # X type matches any character - return None to signal wildcard
-        if char_type == CharType.X:
-            return None, False, None
-        
-        if not range_str:
-            return DEFAULT_CHAR_SETS[char_type], False, None
-        
-        # Check for negation prefix
-        negated = False
-        if range_str.startswith('!'):
-            negated = True
-            range_str = range_str[1:]
-        
-        # Check if this is a literal pattern (contains backticks)
-        if '`' in range_str:
-            literals = self._parse_literals(range_str)
-            return None, negated, literals
-        
-        # Parse character set
-        char_set = set()
-        i = 0
-        
-        while i < len(range_str):
-            char = range_str[i]
+    def _parse_range(self, range_str: str, char_type: CharType) -> tuple[Optional[int], Optional[list[str]]]:
+        """Parse the character range, or return default for the type."""
+        bitmap, literals = _parse_range(range_str, char_type)
+        # Cached results are shared, so each token gets its own literals list
+        return bitmap, list(literals) if literals else None
+    
+    def _parse_length(self, length_str: str, pos: int) -> LengthConstraint:
+        """Parse length constraint string."""
+        try:
+            return _parse_length(length_str)
+        except ValueError as e:
+            raise LexerError(str(e), pos)
+
+
+# The same few type, range and length strings recur across patterns, so
+# their parsed values are cached. Cached LengthConstraints are shared and
+# must not be mutated.
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _parse_char_type(type_str: str) -> CharType:
+    """Parse the character type name; raises ValueError if it is unknown."""
+    return CharType(type_str.strip().lower())
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _parse_range(range_str: str, char_type: CharType) -> tuple[Optional[int], Optional[list[str]]]:
+    """
+    Parse the character range, or return default for the type.
+    
+    Supports:
+    - Empty: use default for type
+    - Range: A-Z, a-z, 0-9
+    - Alternatives: S|s, A|B|C
+    - Combined: A-Za-z
+    - X type: returns -1 (every bit set, matches any character)
+    - NOT: !A-Z (matches anything except A-Z)
+    - Literals: `black`|`WHITE` (matches exact strings)
+    
+    The character set is returned as an integer bitmap with bit ord(c)
+    set for each matching character c, so membership is
+    (bitmap >> ord(c)) & 1. Negation is folded in by inverting the
+    bitmap, which leaves every character outside the set matching.
+    
+    Returns:
+        tuple of (bitmap, literals)
+    """
+    range_str = range_str.strip()
+    
+    # X type matches any character; empty ranges use the type's default
+    if char_type == CharType.X or not range_str:
+        return DEFAULT_BITMAPS[char_type], None
+    
+    # Check for negation prefix
+    negated = False
+    if range_str.startswith('!'):
+        negated = True
+        range_str = range_str[1:]
+    
+    # Check if this is a literal pattern (contains backticks)
+    if '`' in range_str:
+        literals = _parse_literals(range_str)
+        # Negation has no meaning for literal alternatives
+        return None, literals
+    
+    # Parse character set
+    bitmap = 0
+    i = 0
+    
+    while i < len(range_str):
+        char = range_str[i]
+        
+        # Check for pipe-separated alternatives
+        if char == '|':
+            i += 1
+            continue
+        
+        # Check for range like A-Z
+        if i + 2 < len(range_str) and range_str[i + 1] == '-':
+            start = ord(char)
+            end = ord(range_str[i + 2])
             
-            # Check for pipe-separated alternatives
-            if char == '|':
-                i += 1
-                continue
+            # Set all bits from start to end in one go
+            if end >= start:
+                bitmap |= ((1 << (end - start + 1)) - 1) << start
             
-            # Check for range like A-Z
-            if i + 2 < len(range_str) and range_str[i + 1] == '-':
-                start_char = char
-                end_char = range_str[i + 2]
-                
-                # Add all characters in range
-                for code in range(ord(start_char), ord(end_char) + 1):
-                    char_set.add(chr(code))
-                
-                i += 3
-            else:
-                # Single character
-                char_set.add(char)
-                i += 1
-        
-        return ''.join(sorted(char_set)), negated, None
+            i += 3
+        else:
+            # Single character
+            bitmap |= 1 << ord(char)
+            i += 1
     
-    def _parse_literals(self, range_str: str) -> list[str]:
-        """
-        Parse literal strings from backtick-delimited format.
-        
-        Example: `black`|`WHITE` -> ["black", "WHITE"]
-        """
-        literals = []
-        i = 0
-        
-        while i < len(range_str):
-            if range_str[i] == '`':
-                # Find closing backtick
-                end = range_str.find('`', i + 1)
-                if end == -1:
-                    # Unclosed backtick, treat rest as literal
-                    literals.append(range_str[i + 1:])
-                    break
-                literals.append(range_str[i + 1:end])
-                i = end + 1
-            elif range_str[i] == '|':
-                i += 1
-            else:
-                i += 1
-        
-        return literals if literals else None
+    if negated:
+        bitmap = ~bitmap
     
-    def _parse_length(self, length_str: str, pos: int) -> LengthConstraint:
-        """
-        Parse length constraint string.
-        
-        Supports:
-        - Empty: 1 or more (default)
-        - "5": exactly 5
-        - ">=5": 5 or more
-        - "<=5": 5 or less
-        - ">5": more than 5
-        - "<5": less than 5
-        - ">1<5": between 2 and 4 (exclusive)
-        - ">=1<=5": between 1 and 5 (inclusive)
-        """
-        length_str = length_str.strip()
-        
-        if not length_str:
-            return LengthConstraint(min_len=1, max_len=None)
-        
-        # Check for exact length (just a number)
-        if length_str.isdigit():
-            return LengthConstraint(exact_len=int(length_str))
-        
-        min_len = None
-        max_len = None
-        i = 0
-        
-        while i < len(length_str):
-            if length_str[i:i+2] == '>=':
-                i += 2
-                num, i = self._extract_number(length_str, i, pos)
-                min_len = num
-            elif length_str[i:i+2] == '<=':
-                i += 2
-                num, i = self._extract_number(length_str, i, pos)
-                max_len = num
-            elif length_str[i] == '>':
-                i += 1
-                num, i = self._extract_number(length_str, i, pos)
-                min_len = num + 1  # Exclusive: >5 means min is 6
-            elif length_str[i] == '<':
-                i += 1
-                num, i = self._extract_number(length_str, i, pos)
-                max_len = num - 1  # Exclusive: <5 means max is 4
-            else:
-                raise LexerError(
-                    f"Invalid length constraint: {length_str}",
-                    pos
-                )
-        
-        return LengthConstraint(min_len=min_len if min_len is not None else 1, max_len=max_len)
+    return bitmap, None
+
+
+def _parse_literals(range_str: str) -> Optional[list[str]]:
+    """
+    Parse literal strings from backtick-delimited format.
     
-    def _extract_number(self, s: str, start: int, pos: int) -> tuple[int, int]:
-        """Extract a number from string starting at position."""
-        end = start
-        while end < len(s) and s[end].isdigit():
-            end += 1
-        
-        if end == start:
-            raise LexerError(f"Expected number in length constraint", pos)
-        
-        return int(s[start:end]), end
+    Example: `black`|`WHITE` -> ["black", "WHITE"]
+    """
+    literals = []
+    i = 0
+    
+    while i < len(range_str):
+        if range_str[i] == '`':
+            # Find closing backtick
+            end = range_str.find('`', i + 1)
+            if end == -1:
+                # Unclosed backtick, treat rest as literal
+                literals.append(range_str[i + 1:])
+                break
+            literals.append(range_str[i + 1:end])
+            i = end + 1
+        elif range_str[i] == '|':
+            i += 1
+        else:
+            i += 1
+    
+    return literals if literals else None
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _parse_length(length_str: str) -> LengthConstraint:
+    """
+    Parse length constraint string.
+    
+    Supports:
+    - Empty: 1 or more (default)
+    - "5": exactly 5
+    - ">=5": 5 or more
+    - "<=5": 5 or less
+    - ">5": more than 5
+    - "<5": less than 5
+    - ">1<5": between 2 and 4 (exclusive)
+    - ">=1<=5": between 1 and 5 (inclusive)
+    
+    Raises:
+        ValueError: If the constraint is malformed.
+    """
+    length_str = length_str.strip()
+    
+    if not length_str:
+        return LengthConstraint(min_len=1, max_len=None)
+    
+    # Check for exact length (just a number)
+    if length_str.isdigit():
+        return LengthConstraint(exact_len=int(length_str))
+    
+    min_len = None
+    max_len = None
+    i = 0
+    
+    # Each part is an operator followed by a number, with no gaps
+    for m in _LENGTH_PART_RE.finditer(length_str):
+        if m.start() != i:
+            break
+        
+        op, digits = m.groups()
+        if not digits:
+            raise ValueError("Expected number in length constraint")
+        num = int(digits)
+        
+        if op == '>=':
+            min_len = num
+        elif op == '<=':
+            max_len = num
+        elif op == '>':
+            min_len = num + 1  # Exclusive: >5 means min is 6
+        else:
+            max_len = num - 1  # Exclusive: <5 means max is 4
+        i = m.end()
+    
+    if i != len(length_str):
+        raise ValueError(f"Invalid length constraint: {length_str}")
+    
+    return LengthConstraint(min_len=min_len if min_len is not None else 1, max_len=max_len)
+
+
+def purge() -> None:
+    """Clear the cached type, range and length parses."""
+    _parse_char_type.cache_clear()
+    _parse_range.cache_clear()
+    _parse_length.cache_clear()
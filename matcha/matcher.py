@@ -1,15 +1,34 @@
 """
 Matcher engine for SimpleMatch patterns.
 
-Matches text against a parsed AST using backtracking for variable-length patterns.
+Matches text against a parsed AST, using a DFA where possible and
+backtracking over a compiled program for everything else.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional, List
-from matcha.parser import Parser, AST, LiteralNode, PatternNode
+from functools import cached_property, lru_cache
+from typing import Callable, Optional, List, Sequence, Union
+from matcha import _jit, _numpy_scan, _runtime, lexer
+from matcha.codegen import build_backtracker
+from matcha.compiler import CompiledProgram, OP_LITERAL, OP_LITERALS, UNBOUNDED, Span
+from matcha.dfa import DFA, DFABuildError, build_dfa
+from matcha.engine import Backend, BacktrackBackend, select
+from matcha.parser import Parser, AST, LiteralNode
+from matcha.shift_or import masks_for, prefix_bitmaps
 
 
-@dataclass
+# Maximum number of compiled patterns kept by compile()
+_MAXCACHE = 512
+
+# Shortest text find_all_parallel splits into chunks
+_PARALLEL_MIN_LENGTH = 16384
+
+# Shortest search range whose prefilter runs in NumPy rather than Shift-Or
+_VECTOR_MIN_LENGTH = 64
+
+
+@dataclass(slots=True)
 class MatchResult:
     """Result of a pattern match."""
     matched: bool
@@ -25,11 +44,69 @@ class Matcher:
     """
     Matches text against a SimpleMatch AST.
     
-    Uses backtracking to handle variable-length patterns.
+    Uses backtracking to handle variable-length patterns, and builds the
+    pattern's DFA on first use for the table-driven backends.
     """
     
     def __init__(self, ast: AST):
         self.ast = ast
+        # Flat parallel arrays, so the hot loop skips node attribute lookups
+        self.program = CompiledProgram(ast)
+        
+        # Leading literal text and the number of operations it covers
+        self.prefix = _literal_prefix(ast)
+        self._byte_prefix = self.prefix.encode('latin-1') if self.program.latin1 else None
+        self._prefix_ops = 0
+        while (self._prefix_ops < len(self.program)
+               and self.program.ops[self._prefix_ops] == OP_LITERAL):
+            self._prefix_ops += 1
+        
+        # Shift-Or masks for the mandatory prefix (None if it is empty)
+        self._kick_positions = prefix_bitmaps(self.program)
+        self._kick_masks: Optional[List[int]] = None
+        if self._kick_positions:
+            self._kick_masks, self._kick_accept = masks_for(self._kick_positions)
+        
+        # Lookup table for vectorized run scanning (None unless it applies)
+        self._class_table = None
+        if self.program.is_single_class() and _numpy_scan.available():
+            self._class_table = _numpy_scan.class_table(self.program.bitmaps[0])
+    
+    @cached_property
+    def dfa(self) -> Optional[DFA]:
+        """The pattern's DFA, or None if it cannot be built."""
+        try:
+            return build_dfa(self.ast)
+        except DFABuildError:
+            return None
+    
+    @cached_property
+    def _kick_tables(self) -> Optional[list]:
+        """NumPy lookup tables for the mandatory prefix, one per position."""
+        if not self._kick_positions or not _numpy_scan.available():
+            return None
+        
+        tables = {}  # Repeated classes share one table
+        for bitmap in self._kick_positions:
+            if bitmap not in tables:
+                tables[bitmap] = _numpy_scan.class_table(bitmap)
+        return [tables[bitmap] for bitmap in self._kick_positions]
+    
+    @cached_property
+    def generated(self) -> Optional[Callable[[bytes, int, set], int]]:
+        """The pattern's generated backtracking function, or None if it has none."""
+        return build_backtracker(self.program)
+    
+    def _subject(self, text: str) -> Union[str, bytes]:
+        """The text as latin-1 bytes, or unchanged if it cannot be encoded."""
+        # Bytes index as ints and offsets match the str, so results are
+        # still sliced from the original text
+        if self.program.latin1:
+            try:
+                return text.encode('latin-1')
+            except UnicodeEncodeError:
+                pass
+        return text
     
     def match_full(self, text: str) -> MatchResult:
         """
@@ -38,9 +115,13 @@ class Matcher:
         Returns:
             MatchResult with matched=True if entire text matches.
         """
-        success, end_pos = self._match_at(text, 0, 0)
+        data = self._subject(text)
+        if isinstance(data, bytes) and self.generated is not None:
+            end_pos = self.generated(data, 0, set())
+        else:
+            end_pos = self._match_at(data, 0, 0, set())
         
-        if success and end_pos == len(text):
+        if end_pos == len(text):
             return MatchResult(matched=True, value=text, start=0, end=len(text))
         
         return MatchResult(matched=False)
@@ -52,18 +133,18 @@ class Matcher:
         Returns:
             MatchResult if found, None if no match.
         """
-        for start in range(len(text)):
-            success, end_pos = self._match_at(text, start, 0)
-            
-            if success:
-                return MatchResult(
-                    matched=True,
-                    value=text[start:end_pos],
-                    start=start,
-                    end=end_pos
-                )
-        
-        return None
+        span = self.find_span(text)
+        if span is None:
+            return None
+        
+        start, end = span
+        return MatchResult(matched=True, value=text[start:end], start=start, end=end)
+    
+    def find_span(self, text: str) -> Optional[Span]:
+        """Return the (start, end) span of the first match, or None."""
+        data = self._subject(text)
+        spans = self._scan(data, 0, len(data), limit=1)
+        return spans[0] if spans else None
     
     def find_all(self, text: str) -> List[MatchResult]:
         """
@@ -72,143 +153,458 @@ class Matcher:
         Returns:
             List of MatchResult for each match found.
         """
-        results = []
-        pos = 0
+        return [
+            MatchResult(matched=True, value=text[start:end], start=start, end=end)
+            for start, end in self.find_all_spans(text)
+        ]
+    
+    def find_all_spans(self, text: str) -> List[Span]:
+        """
+        Find all non-overlapping matches in the text as (start, end) spans.
         
-        while pos < len(text):
-            success, end_pos = self._match_at(text, pos, 0)
-            
-            if success:
-                results.append(MatchResult(
-                    matched=True,
-                    value=text[pos:end_pos],
-                    start=pos,
-                    end=end_pos
-                ))
-                pos = end_pos  # Move past this match
-            else:
-                pos += 1
+        Callers that only need offsets or substrings use this to skip
+        building a MatchResult per match.
+        """
+        data = self._subject(text)
+        if self._class_table is not None and isinstance(data, bytes):
+            return self._find_all_class(data)
         
-        return results
+        return self._scan(data, 0, len(data))
     
-    def _match_at(self, text: str, text_pos: int, ast_idx: int) -> tuple[bool, int]:
+    def find_all_parallel(self, text: str, chunk: int = 65536,
+                          workers: Optional[int] = None) -> List[MatchResult]:
         """
-        Try to match starting at text_pos with AST starting at ast_idx.
+        Find all non-overlapping matches, scanning chunks of the text in threads.
         
-        Uses recursive backtracking for variable-length patterns.
+        Each worker runs the pattern's DFA over the matches starting inside
+        its chunk, without the GIL, reading past the chunk end as far as a
+        match needs. A match that runs into the next chunk can put that
+        chunk's matches out of step with a sequential scan, so the merge
+        rescans from the end of such a match until it reaches a point where
+        the chunk's scan agrees again. The result is always the same as
+        find_all.
         
-        Returns:
-            (success, end_position) tuple
+        Needs compiled DFA loops (the matcha._dfa extension or numba);
+        without them, and for texts shorter than 16 KB or patterns the DFA
+        does not run, this is find_all.
+        
+        Args:
+            text: Text to search in
+            chunk: Number of start positions per worker
+            workers: Thread count (None = the executor's default)
+        """
+        data = self._subject(text)
+        size = len(data)
+        if size < _PARALLEL_MIN_LENGTH or not isinstance(data, bytes):
+            return self.find_all(text)
+        
+        loops = _runtime.load()
+        if loops is None or self._dfa_arrays is None:
+            return self.find_all(text)
+        
+        find_spans = loops.find_spans
+        table, accepts = self._dfa_arrays
+        bounds = [(lo, min(lo + chunk, size)) for lo in range(0, size, chunk)]
+        with ThreadPoolExecutor(workers) as pool:
+            parts = list(pool.map(
+                lambda b: find_spans(table, accepts, data, b[0], b[1]), bounds
+            ))
+        
+        spans: List[Span] = []
+        resume = 0  # Where a sequential scan would continue searching
+        for (lo, hi), part in zip(bounds, parts):
+            while True:
+                # The chunk's scan agrees from its first match at or after the
+                # resume point, unless an earlier one still covers that point
+                k = 0
+                while k < len(part) and part[k][0] < resume:
+                    k += 1
+                if k == 0 or part[k - 1][1] <= resume:
+                    spans.extend(part[k:])
+                    if k < len(part):
+                        resume = part[-1][1]
+                    break
+                
+                # Out of step: take one sequential step and check again
+                step = find_spans(table, accepts, data, resume, hi, 1)
+                if not step:
+                    break
+                spans.append(step[0])
+                resume = step[0][1]
+        
+        return [
+            MatchResult(matched=True, value=text[start:end], start=start, end=end)
+            for start, end in spans
+        ]
+    
+    @cached_property
+    def _dfa_arrays(self) -> Optional[tuple]:
         """
-        # Base case: consumed all AST nodes
-        if ast_idx >= len(self.ast):
-            return True, text_pos
+        The DFA's table and accepts for the compiled loops, or None.
         
-        node = self.ast[ast_idx]
+        None as well for literal alternatives, which the DFA matches
+        longest-first rather than in the order they are written.
+        """
+        loops = _runtime.load()
+        if loops is None or OP_LITERALS in self.program.ops or self.dfa is None:
+            return None
+        return loops.arrays(self.dfa)
+    
+    def _scan(self, text: Union[str, bytes], lo: int, hi: int,
+              limit: Optional[int] = None) -> List[Span]:
+        """
+        Spans of the non-overlapping matches starting in [lo, hi).
         
-        if isinstance(node, LiteralNode):
-            # Must match exact character
-            if text_pos >= len(text):
-                return False, text_pos
+        Searches from lo like find_all; matches may end past hi. Stops
+        after `limit` matches if given.
+        """
+        spans = []
+        failed = set()
+        skip = len(self.prefix)
+        generated = self.generated if isinstance(text, bytes) else None
+        pos = lo
+        
+        for start in self._candidates(text, lo, hi):
+            if start < pos:
+                continue  # Inside the previous match
             
-            if text[text_pos] != node.value:
-                return False, text_pos
+            if generated is not None:
+                end_pos = generated(text, start, failed)
+            else:
+                # Candidates already start with the literal prefix
+                end_pos = self._match_at(text, start + skip, self._prefix_ops, failed)
             
-            return self._match_at(text, text_pos + 1, ast_idx + 1)
-        
-        elif isinstance(node, PatternNode):
-            # Try to match variable-length pattern with backtracking
-            return self._match_pattern(text, text_pos, ast_idx, node)
+            if end_pos >= 0:
+                spans.append((start, end_pos))
+                if len(spans) == limit:
+                    break
+                pos = end_pos  # Move past this match
         
-        return False, text_pos
+        return spans
+    
+    def _find_all_class(self, data: bytes) -> List[Span]:
+        """find_all_spans for a single class run, over latin-1 bytes with NumPy."""
+        program = self.program
+        return _numpy_scan.find_all_class(
+            self._class_table, data, program.min_lens[0], program.max_lens[0]
+        )
     
-    def _match_pattern(
-        self, text: str, text_pos: int, ast_idx: int, node: PatternNode
-    ) -> tuple[bool, int]:
+    def _candidates(self, text: Union[str, bytes], lo: int = 0,
+                    hi: Optional[int] = None) -> Sequence[int]:
         """
-        Match a pattern node with backtracking.
+        Start positions in [lo, hi) worth trying, in order.
         
-        Tries matching from max_len down to min_len to find a valid continuation.
+        Finds every occurrence of the literal prefix with find(), or
+        runs the Shift-Or prefilter over the text once (a NumPy pass per
+        prefix position on longer latin-1 text) and returns every
+        position where the mandatory prefix matches; without either,
+        every position is a candidate.
         """
-        # Handle literal string matching (e.g., `black`|`WHITE`)
-        if node.literals:
-            return self._match_literals(text, text_pos, ast_idx, node)
+        if hi is None:
+            hi = len(text)
         
-        # char_set=None means X type (matches any character)
-        is_wildcard = node.char_set is None and not node.literals
-        char_set = set(node.char_set) if node.char_set else None
-        negated = node.negated
+        prefix = self._byte_prefix if isinstance(text, bytes) else self.prefix
+        if prefix:
+            # Occurrences must start before hi but may end after it
+            stop = hi + len(prefix) - 1
+            starts = []
+            start = text.find(prefix, lo, stop)
+            while start != -1:
+                starts.append(start)
+                start = text.find(prefix, start + 1, stop)
+            return starts
         
-        # Count how many consecutive characters match the pattern
-        match_len = 0
-        pos = text_pos
+        masks = self._kick_masks
+        if masks is None:
+            return range(lo, hi)
         
-        while pos < len(text):
-            char = text[pos]
-            # Determine if this character matches
-            if is_wildcard:
-                matches = True
-            elif negated:
-                # Negated: match if char is NOT in char_set
-                matches = char not in char_set
+        if isinstance(text, bytes) and hi - lo >= _VECTOR_MIN_LENGTH:
+            tables = self._kick_tables
+            if tables is not None:
+                return _numpy_scan.prefix_starts(tables, text, lo, hi)
+        
+        accept = self._kick_accept
+        length = len(self._kick_positions)
+        starts = []
+        state = 0
+        
+        stop = hi + length - 1
+        if lo or stop < len(text):
+            text = text[lo:stop]
+        
+        # Iterating bytes yields codes directly
+        codes = text if isinstance(text, bytes) else map(ord, text)
+        for i, code in enumerate(codes, lo):
+            mask = masks[code] if code < 256 else self._high_mask(code)
+            state = ((state << 1) | 1) & mask
+            if state & accept:
+                starts.append(i + 1 - length)
+        
+        return starts
+    
+    def _high_mask(self, code: int) -> int:
+        """Shift-Or mask for a character beyond latin-1."""
+        mask = 0
+        for bit, bitmap in enumerate(self._kick_positions):
+            if (bitmap >> code) & 1:
+                mask |= 1 << bit
+        return mask
+    
+    def _match_at(self, text: Union[str, bytes], text_pos: int, ast_idx: int,
+                  failed: set) -> int:
+        """
+        Try to match starting at text_pos with the program starting at ast_idx.
+        
+        Backtracks over variable-length operations with an explicit stack
+        of choice points instead of recursion, so long patterns and inputs
+        cannot hit the recursion limit. Each choice point holds the next
+        operation index, the end positions of the operation before it in
+        preference order, and the index of the next end to try.
+        
+        Whether the rest of the program matches from a given operation and
+        position does not depend on how the matcher got there, so choice
+        points that run out of candidates are recorded in `failed` and
+        never explored again. Callers share one set across all start
+        positions in a text, which keeps backtracking polynomial.
+        
+        Returns:
+            End position of the match, or -1 if there is none.
+        """
+        program = self.program
+        ops = program.ops
+        literals = program.byte_literals if isinstance(text, bytes) else program.literals
+        size = len(ops)
+        stride = len(text) + 1
+        stack = []
+        
+        while True:
+            # Literal operations never backtrack, so consume them in a loop
+            while ast_idx < size and ops[ast_idx] == OP_LITERAL:
+                value = literals[ast_idx]
+                if not text.startswith(value, text_pos):
+                    break
+                text_pos += len(value)
+                ast_idx += 1
             else:
-                # Normal: match if char IS in char_set
-                matches = char in char_set
-            
-            if matches:
-                match_len += 1
-                pos += 1
+                # Base case: consumed all operations
+                if ast_idx >= size:
+                    return text_pos
                 
-                # Stop if we've reached max length
-                if node.max_len is not None and match_len >= node.max_len:
+                key = ast_idx * stride + text_pos
+                if key not in failed:
+                    if ops[ast_idx] == OP_LITERALS:
+                        ends = self._match_literals(text, text_pos, ast_idx)
+                    else:
+                        ends = self._match_pattern(text, text_pos, ast_idx)
+                    
+                    if ends:
+                        # Take the preferred end now; remember the rest
+                        if len(ends) > 1:
+                            stack.append((ast_idx + 1, ends, 1, key))
+                        ast_idx += 1
+                        text_pos = ends[0]
+                        continue
+            
+            # Backtrack to the most recent choice point with candidates left
+            while stack:
+                next_idx, ends, k, key = stack[-1]
+                if k < len(ends):
+                    stack[-1] = (next_idx, ends, k + 1, key)
+                    ast_idx, text_pos = next_idx, ends[k]
                     break
+                stack.pop()
+                failed.add(key)  # Every candidate failed
             else:
-                break
+                return -1
+    
+    def _match_pattern(self, text: Union[str, bytes], text_pos: int,
+                       ast_idx: int) -> range:
+        """
+        Match a character-class operation.
         
-        # Try lengths from max to min (greedy with backtracking)
-        max_try = match_len
-        min_try = node.min_len
-        
-        # Handle min_len=0 (optional patterns) - range needs to include 0
-        for try_len in range(max_try, min_try - 1, -1):
-            # Ensure we don't go below 0
-            if try_len < 0:
-                continue
-            # Check if this length satisfies constraints
-            if try_len < node.min_len:
-                continue
-            if node.max_len is not None and try_len > node.max_len:
-                continue
-            
-            # Try to match rest of pattern with this length
-            success, end_pos = self._match_at(text, text_pos + try_len, ast_idx + 1)
-            if success:
-                return True, end_pos
-        
-        # Special case: if min_len is 0 and we haven't tried 0 yet
-        if node.min_len == 0 and match_len == 0:
-            success, end_pos = self._match_at(text, text_pos, ast_idx + 1)
-            if success:
-                return True, end_pos
-        
-        return False, text_pos
+        Returns:
+            End positions to try, from the longest run down to min_len
+            (greedy with backtracking).
+        """
+        program = self.program
+        
+        # Negation is folded into the bitmap, and X type has every bit set
+        bitmap = program.bitmaps[ast_idx]
+        accept = program.accepts[ast_idx]
+        min_len = program.min_lens[ast_idx]
+        max_len = program.max_lens[ast_idx]
+        
+        # Clamp the run to max_len once, so the loops only test characters
+        end = len(text)
+        if max_len != UNBOUNDED and end - text_pos > max_len:
+            end = text_pos + max_len
+        
+        # Scan the longest run of matching characters
+        pos = text_pos
+        
+        if accept is None:
+            # Wildcard: every remaining character matches
+            pos = end
+        elif isinstance(text, bytes):
+            # Bytes need only the table
+            while pos < end and accept[text[pos]]:
+                pos += 1
+        else:
+            while pos < end:
+                code = ord(text[pos])
+                # Table lookup for latin-1; characters beyond it test the bitmap
+                if not (accept[code] if code < 256 else (bitmap >> code) & 1):
+                    break
+                pos += 1
+        
+        # Lengths below min_len (including negative ones) never match
+        return range(pos, text_pos + max(min_len, 0) - 1, -1)
     
-    def _match_literals(
-        self, text: str, text_pos: int, ast_idx: int, node: PatternNode
-    ) -> tuple[bool, int]:
+    def _match_literals(self, text: Union[str, bytes], text_pos: int,
+                        ast_idx: int) -> List[int]:
         """
         Match literal strings from a list of alternatives.
         
-        Example: node.literals = ["black", "WHITE"] matches either "black" or "WHITE"
+        Example: literals = ["black", "WHITE"] matches either "black" or "WHITE"
+        
+        Returns:
+            End positions of the alternatives present at text_pos, in the
+            order the alternatives are written.
         """
-        for literal in node.literals:
-            if text[text_pos:].startswith(literal):
-                # Found a matching literal, try to continue with rest of pattern
-                success, end_pos = self._match_at(text, text_pos + len(literal), ast_idx + 1)
-                if success:
-                    return True, end_pos
+        as_bytes = isinstance(text, bytes)
+        if as_bytes:
+            literals = self.program.byte_literals[ast_idx]
+        else:
+            literals = self.program.literals[ast_idx]
+        
+        if len(literals) == 1:
+            literal = literals[0]
+            return [text_pos + len(literal)] if text.startswith(literal, text_pos) else []
+        
+        # Walk the trie once to find every alternative present at text_pos;
+        # only alternatives sharing the text's first character are visited
+        node = self.program.tries[ast_idx]
+        found = []
+        pos = text_pos
+        end = len(text)
+        while True:
+            if None in node:
+                found.extend(node[None])
+            if pos >= end:
+                break
+            node = node.get(text[pos] if as_bytes else ord(text[pos]))
+            if node is None:
+                break
+            pos += 1
         
-        return False, text_pos
+        if len(found) > 1:
+            found.sort()
+        return [text_pos + len(literals[index]) for index in found]
+
+
+def _literal_prefix(ast: AST) -> str:
+    """Return the literal text every match must start with."""
+    parts = []
+    for node in ast:
+        if not isinstance(node, LiteralNode):
+            break
+        parts.append(node.value)
+    return "".join(parts)
+
+
+class CompiledPattern:
+    """
+    A pattern compiled once for repeated matching.
+
+    The engine selector picks a backend from the pattern's shape (see
+    matcha.engine.selector): generated code for fixed-length patterns,
+    the Matcher's DFA for most others, and the backtracking Matcher for
+    literal alternatives. Text is encoded to latin-1 bytes once per call
+    for the non-backtracking backends; text that does not encode goes
+    through the backtracking Matcher. With the JIT enabled (see
+    matcha._jit), a pattern used JIT_THRESHOLD times is re-selected,
+    which moves DFA patterns to native code when a C toolchain is
+    available.
+
+    Example:
+        pattern = compile("[dec::]")
+        pattern.find_all("abc123def456")  # ["123", "456"]
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.ast = Parser(pattern).parse()
+        self.matcher = Matcher(self.ast)
+        self.prefix = self.matcher.prefix
+
+        self.fallback = BacktrackBackend(self.matcher)
+        self.engine: Backend = select(self)
+        self._uses = 0
+
+    def __repr__(self) -> str:
+        return f"CompiledPattern({self.pattern!r})"
+
+    def _backend_for(self, text: str) -> tuple[Backend, Union[str, bytes]]:
+        """
+        Pick the backend for this text and the input to run it over.
+
+        Re-selects the engine once the pattern is hot, if the JIT is
+        enabled. Latin-1 backends get the text encoded once; each byte is
+        one character, so spans index the original str unchanged.
+        """
+        if _jit.ENABLED and self._uses < _jit.JIT_THRESHOLD:
+            self._uses += 1
+            if self._uses == _jit.JIT_THRESHOLD:
+                self.engine = select(self, hot=True)
+
+        engine = self.engine
+        if not engine.latin1_only:
+            return engine, text
+        try:
+            return engine, text.encode('latin-1')
+        except UnicodeEncodeError:
+            return self.fallback, text
+
+    def match(self, text: str) -> bool:
+        """Check if the entire text matches the pattern."""
+        backend, data = self._backend_for(text)
+        return backend.fullmatch(data)
+
+    def find(self, text: str) -> Optional[str]:
+        """Find the first match in the text, or None if not found."""
+        backend, data = self._backend_for(text)
+        span = backend.find(data)
+        return text[span[0]:span[1]] if span else None
+
+    def find_all(self, text: str) -> List[str]:
+        """Find all non-overlapping matches in the text."""
+        backend, data = self._backend_for(text)
+        return [text[start:end] for start, end in backend.find_all_spans(data)]
+
+
+@lru_cache(maxsize=_MAXCACHE)
+def _compile(pattern: str) -> CompiledPattern:
+    return CompiledPattern(pattern)
+
+
+def compile(pattern: str) -> CompiledPattern:
+    """
+    Compile a pattern for repeated use.
+
+    Compiled patterns are cached, so calling match/find/find_all with the
+    same pattern string repeatedly only lexes and parses it once.
+
+    Example:
+        >>> compile("[dec::]").find_all("abc123def456")
+        ['123', '456']
+    """
+    return _compile(pattern)
+
+
+def purge() -> None:
+    """Clear the compiled pattern cache and the lexer's caches."""
+    _compile.cache_clear()
+    lexer.purge()
 
 
 def match(pattern: str, text: str) -> bool:
@@ -228,10 +624,7 @@ def match(pattern: str, text: str) -> bool:
         >>> match("[str:A-Z:]", "Hello")
         False
     """
-    ast = Parser(pattern).parse()
-    matcher = Matcher(ast)
-    result = matcher.match_full(text)
-    return result.matched
+    return _compile(pattern).match(text)
 
 
 def find(pattern: str, text: str) -> Optional[str]:
@@ -249,10 +642,7 @@ def find(pattern: str, text: str) -> Optional[str]:
         >>> find("[dec::]", "abc123def")
         '123'
     """
-    ast = Parser(pattern).parse()
-    matcher = Matcher(ast)
-    result = matcher.find_first(text)
-    return result.value if result else None
+    return _compile(pattern).find(text)
 
 
 def find_all(pattern: str, text: str) -> List[str]:
@@ -270,7 +660,4 @@ def find_all(pattern: str, text: str) -> List[str]:
         >>> find_all("[dec::]", "abc123def456")
         ['123', '456']
     """
-    ast = Parser(pattern).parse()
-    matcher = Matcher(ast)
-    results = matcher.find_all(text)
-    return [r.value for r in results]
+    return _compile(pattern).find_all(text)
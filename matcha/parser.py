@@ -7,33 +7,31 @@ Converts a token stream into an Abstract Syntax Tree (AST).
 from dataclasses import dataclass, field
 from typing import List, Union, Optional
 from matcha.lexer import Lexer
-from matcha.tokens import Token, TokenType
+from matcha.tokens import Token, TokenType, bitmap_to_chars
 
 
-@dataclass
+@dataclass(slots=True)
 class LiteralNode:
-    """AST node for a literal character to match exactly."""
+    """AST node for a literal character or run of characters to match exactly."""
     value: str
     
     def __repr__(self) -> str:
         return f"Literal({self.value!r})"
 
 
-@dataclass
+@dataclass(slots=True)
 class PatternNode:
     """AST node for a pattern token [type:range:length]."""
-    char_set: Optional[str]
+    bitmap: Optional[int]  # Bit ord(c) set if c matches; None for literals
     min_len: int
     max_len: int | None  # None means unbounded
-    negated: bool = False  # If True, match characters NOT in char_set
     literals: Optional[list[str]] = None  # Literal strings to match
     
     def __repr__(self) -> str:
         max_str = str(self.max_len) if self.max_len else "∞"
-        neg = "!" if self.negated else ""
         if self.literals:
             return f"Pattern(literals={self.literals}, len={self.min_len}-{max_str})"
-        return f"Pattern(chars={neg}{self.char_set!r}, len={self.min_len}-{max_str})"
+        return f"Pattern(chars={bitmap_to_chars(self.bitmap)!r}, len={self.min_len}-{max_str})"
 
 
 # AST is a list of nodes
@@ -57,7 +55,6 @@ class Parser:
     
     def __init__(self, pattern: str):
         self.pattern = pattern
-        self.lexer = Lexer(pattern)
     
     def parse(self) -> AST:
         """
@@ -71,7 +68,8 @@ class Parser:
         """
         ast: AST = []
         
-        for token in self.lexer.tokenize():
+        # A fresh lexer per call keeps parse() repeatable
+        for token in Lexer(self.pattern).tokens():
             node = self._token_to_node(token)
             ast.append(node)
         
@@ -79,16 +77,15 @@ class Parser:
     
     def _token_to_node(self, token: Token) -> ASTNode:
         """Convert a token to an AST node."""
-        if token.token_type == TokenType.LITERAL:
+        if token.token_type in (TokenType.LITERAL, TokenType.LITERAL_RUN):
             return LiteralNode(value=token.value)
         
         # PATTERN token
         length = token.length
         return PatternNode(
-            char_set=token.char_set,
+            bitmap=token.bitmap,
             min_len=length.get_min(),
             max_len=length.get_max(),
-            negated=token.negated,
             literals=token.literals
         )
 
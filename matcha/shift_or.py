@@ -0,0 +1,160 @@
+"""
+Bit-parallel matcher for fixed-length SimpleMatch patterns.
+
+Patterns such as "[dec::3]-[dec::4]" or "#[hex::6]" have a known length
+and one character class per position. Each position becomes one bit of
+a Python int, so the whole pattern advances with a single shift and AND
+per input byte (the Shift-And formulation of Shift-Or).
+"""
+
+from typing import List, Optional
+from matcha.compiler import CompiledProgram, LATIN1, OP_CLASS, OP_LITERAL, Span
+
+# Longest pattern handled, so the state fits in one machine word
+MAX_POSITIONS = 64
+
+
+class ShiftOr:
+    """
+    Shift-And matcher over latin-1 bytes.
+
+    Bit i of masks[c] is set if byte c is allowed at pattern position i.
+    """
+
+    def __init__(self, masks: List[int], accept_bit: int, length: int):
+        self.masks = masks
+        self.accept_bit = accept_bit
+        self.length = length
+
+    def fullmatch(self, data: bytes) -> bool:
+        """Check if the entire input matches."""
+        if len(data) != self.length:
+            return False
+
+        masks = self.masks
+        state = 0
+        for c in data:
+            state = ((state << 1) | 1) & masks[c]
+        return bool(state & self.accept_bit)
+
+    def find(self, data: bytes) -> Optional[Span]:
+        """Return the (start, end) span of the first match, or None."""
+        masks = self.masks
+        accept_bit = self.accept_bit
+        state = 0
+
+        for i, c in enumerate(data):
+            state = ((state << 1) | 1) & masks[c]
+            if state & accept_bit:
+                return i + 1 - self.length, i + 1
+
+        return None
+
+    def find_all_spans(self, data: bytes) -> List[Span]:
+        """Return (start, end) spans of all non-overlapping matches."""
+        masks = self.masks
+        accept_bit = self.accept_bit
+        length = self.length
+        spans = []
+        state = 0
+
+        for i, c in enumerate(data):
+            state = ((state << 1) | 1) & masks[c]
+            if state & accept_bit:
+                spans.append((i + 1 - length, i + 1))
+                state = 0  # Matches must not overlap
+
+        return spans
+
+
+def position_bitmaps(program: CompiledProgram) -> Optional[List[int]]:
+    """
+    List the class bitmap for each pattern position.
+
+    Returns:
+        One bitmap per position, or None if the pattern is not fixed-length.
+    """
+    positions = []
+
+    for i, op in enumerate(program.ops):
+        if op == OP_LITERAL:
+            positions.extend(1 << ord(c) for c in program.literals[i])
+        elif op == OP_CLASS and program.min_lens[i] == program.max_lens[i]:
+            positions.extend([program.bitmaps[i] & LATIN1] * program.min_lens[i])
+        else:
+            return None
+
+        if len(positions) > MAX_POSITIONS:
+            return None
+
+    return positions
+
+
+def prefix_bitmaps(program: CompiledProgram) -> List[int]:
+    """
+    List the class bitmap for each position every match must start with.
+
+    Covers the literal and fixed-count operations at the start of the
+    program plus the mandatory part of the first variable-length class,
+    up to MAX_POSITIONS. Bitmaps are not limited to latin-1.
+    """
+    positions = []
+
+    for i, op in enumerate(program.ops):
+        if op == OP_LITERAL:
+            positions.extend(1 << ord(c) for c in program.literals[i])
+        elif op == OP_CLASS:
+            positions.extend([program.bitmaps[i]] * program.min_lens[i])
+            if program.min_lens[i] != program.max_lens[i]:
+                break
+        else:
+            break
+
+        if len(positions) >= MAX_POSITIONS:
+            break
+
+    return positions[:MAX_POSITIONS]
+
+
+def masks_for(positions: List[int]) -> tuple[List[int], int]:
+    """
+    Build the per-byte masks for a list of position bitmaps.
+
+    Returns:
+        (masks, accept_bit), where bit i of masks[c] is set if byte c is
+        allowed at position i.
+    """
+    masks = [0] * 256
+    for bit, bitmap in enumerate(positions):
+        # Visit only the set bits rather than testing all 256 bytes
+        bitmap &= LATIN1
+        while bitmap:
+            low = bitmap & -bitmap
+            masks[low.bit_length() - 1] |= 1 << bit
+            bitmap ^= low
+
+    return masks, 1 << (len(positions) - 1)
+
+
+def build_masks(program: CompiledProgram) -> Optional[tuple[List[int], int]]:
+    """
+    Build the per-byte masks for a fixed-length program.
+
+    Returns:
+        (masks, accept_bit), or None if the program is not fixed-length
+        or is empty or longer than MAX_POSITIONS.
+    """
+    positions = position_bitmaps(program)
+    if not positions:
+        return None
+    return masks_for(positions)
+
+
+def build_shift_or(program: CompiledProgram) -> Optional[ShiftOr]:
+    """Build a ShiftOr matcher, or None if the program does not qualify."""
+    built = build_masks(program)
+    if built is None:
+        return None
+
+    masks, accept_bit = built
+    return ShiftOr(masks, accept_bit, accept_bit.bit_length())
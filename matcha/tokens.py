@@ -11,6 +11,7 @@ import string
 class TokenType(Enum):
     """Types of tokens in a pattern."""
     LITERAL = auto()    # Literal character to match exactly
+    LITERAL_RUN = auto()  # Run of literal characters to match exactly
     PATTERN = auto()    # Pattern token [type:range:length]
 
 
@@ -36,9 +37,53 @@ DEFAULT_CHAR_SETS: dict[CharType, str] = {
 }
 
 
-@dataclass
+def _mask_from_string(chars: str) -> int:
+    """Build a character-class bitmap with bit ord(c) set for each c."""
+    bitmap = 0
+    for char in chars:
+        bitmap |= 1 << ord(char)
+    return bitmap
+
+
+# Bitmaps for the default character sets, built once at import and shared
+# by every token that uses a default range. X matches every character.
+DEFAULT_BITMAPS: dict[CharType, int] = {
+    char_type: _mask_from_string(chars) for char_type, chars in DEFAULT_CHAR_SETS.items()
+}
+DEFAULT_BITMAPS[CharType.X] = -1
+
+
+def bitmap_to_chars(bitmap: int) -> str:
+    """
+    Render a character-class bitmap as the characters it contains.
+
+    Negative bitmaps (negated classes) are rendered with a leading "!".
+    """
+    if bitmap < 0:
+        return "!" + bitmap_to_chars(~bitmap)
+    return "".join(chr(code) for code in range(bitmap.bit_length()) if (bitmap >> code) & 1)
+
+
+def bitmap_ranges(bitmap: int, limit: int = 256) -> list[tuple[int, int]]:
+    """
+    Split the codes below `limit` in a bitmap into inclusive (lo, hi) runs.
+
+    Example: the bitmap of "0-9a-f" gives [(48, 57), (97, 102)].
+    """
+    bitmap &= (1 << limit) - 1
+    ranges = []
+    while bitmap:
+        lo = (bitmap & -bitmap).bit_length() - 1
+        run = bitmap >> lo
+        length = (~run & (run + 1)).bit_length() - 1  # Trailing one bits
+        ranges.append((lo, lo + length - 1))
+        bitmap &= ~(((1 << length) - 1) << lo)
+    return ranges
+
+
+@dataclass(frozen=True, slots=True)
 class LengthConstraint:
-    """Represents length constraints for a pattern token."""
+    """Represents length constraints for a pattern token (shared, so immutable)."""
     min_len: Optional[int] = 1       # Minimum length (None = no minimum)
     max_len: Optional[int] = None    # Maximum length (None = no maximum)
     exact_len: Optional[int] = None  # Exact length (overrides min/max if set)
@@ -68,24 +113,24 @@ class LengthConstraint:
         return self.max_len
 
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     """A token in the pattern."""
     token_type: TokenType
-    value: str  # For LITERAL: the character; For PATTERN: the raw [type:range:length]
+    value: str  # For LITERAL/LITERAL_RUN: the text; For PATTERN: the raw [type:range:length]
     
     # Only for PATTERN tokens
     char_type: Optional[CharType] = None
-    char_set: Optional[str] = None  # Resolved character set to match against
+    bitmap: Optional[int] = None  # Bit ord(c) set if c matches (negated classes are inverted)
     length: Optional[LengthConstraint] = None
-    negated: bool = False  # If True, match characters NOT in char_set
     literals: Optional[list[str]] = None  # Literal strings to match (e.g., [`black`|`WHITE`])
     
     def __repr__(self) -> str:
         if self.token_type == TokenType.LITERAL:
             return f"LITERAL({self.value!r})"
-        neg = "!" if self.negated else ""
+        if self.token_type == TokenType.LITERAL_RUN:
+            return f"LITERAL_RUN({self.value!r})"
         if self.literals:
             return f"PATTERN(type={self.char_type.value}, literals={self.literals}, len={self.length})"
-        return f"PATTERN(type={self.char_type.value}, chars={neg}{self.char_set!r}, len={self.length})"
+        return f"PATTERN(type={self.char_type.value}, chars={bitmap_to_chars(self.bitmap)!r}, len={self.length})"
 
@@ -0,0 +1,23 @@
+"""
+Build script for matcha.
+
+Compiles the optional matcha._dfa extension with -O3 (-march=native is
+left out so built wheels stay portable). pyproject.toml lists Cython as
+a build requirement, so pip builds always have it; without Cython, or if
+the C build fails, matcha installs as pure Python and falls back to
+numba or the interpreter for the DFA loop.
+"""
+
+from setuptools import find_packages, setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize(["matcha/_dfa.pyx"])
+    for ext in ext_modules:
+        ext.optional = True  # A missing C compiler must not break the install
+        ext.extra_compile_args = ["-O3"]
+
+setup(packages=find_packages(include=["matcha", "matcha.*"]), ext_modules=ext_modules)
@@ -0,0 +1,100 @@
+"""
+Tests for code generation of fixed-length patterns and backtrackers.
+"""
+
+from matcha.codegen import MAX_CHOICE_POINTS, build_backtracker, build_fixed, generate_backtracker
+from matcha.compiler import CompiledProgram
+from matcha.parser import Parser
+
+
+def fixed_for(pattern: str):
+    return build_fixed(CompiledProgram(Parser(pattern).parse()))
+
+
+class TestBuildFixed:
+    """Test which patterns qualify."""
+    
+    def test_fixed_length(self):
+        """Test fixed-length patterns are accepted."""
+        assert fixed_for("[dec::3]-[dec::3]-[dec::4]").length == 12
+        assert fixed_for("#[hex::6]").length == 7
+    
+    def test_rejected(self):
+        """Test variable-length and non-latin-1 patterns are rejected."""
+        assert fixed_for("[dec::]") is None
+        assert fixed_for("[str::>=2<=4]") is None
+        assert fixed_for("[dec::2]€") is None
+        assert fixed_for("") is None
+    
+    def test_literal_bytes_inlined(self):
+        """Test literal positions compile to equality tests and a find skip."""
+        source = fixed_for("[dec::2]-").source
+        
+        assert "s[i + 2] == 45" in source
+        assert "s.find(45, i + 2)" in source
+    
+    def test_single_range_compared(self):
+        """Test a class that is one byte range compiles to a chained comparison."""
+        source = fixed_for("[dec::2][hex::1]").source
+        
+        assert "48 <= s[i] <= 57" in source
+        assert "s[i + 2] <=" not in source  # Hex is three ranges: bitmap shift
+
+
+class TestFixedMatch:
+    """Test matching with generated code."""
+    
+    def test_fullmatch(self):
+        """Test full-string matching."""
+        matcher = fixed_for("#[hex::6]")
+        
+        assert matcher.fullmatch(b"#ff00aa")
+        assert not matcher.fullmatch(b"#ff00a")
+        assert not matcher.fullmatch(b"#ff00ag")
+    
+    def test_find(self):
+        """Test finding the first match."""
+        matcher = fixed_for("[dec::3]-[dec::4]")
+        
+        assert matcher.find(b"call 555-1234 now") == (5, 13)
+        assert matcher.find(b"call 55-1234 now") is None
+    
+    def test_find_all_spans(self):
+        """Test matches do not overlap."""
+        assert fixed_for("[dec::2]").find_all_spans(b"12345") == [(0, 2), (2, 4)]
+        assert fixed_for("[x::2]").find_all_spans(b"abc") == [(0, 2)]
+
+
+def backtracker_for(pattern: str):
+    return build_backtracker(CompiledProgram(Parser(pattern).parse()))
+
+
+class TestBacktracker:
+    """Test generated backtracking functions."""
+    
+    def test_unrolled_source(self):
+        """Test operations are inlined and choice points become loops."""
+        source = generate_backtracker(CompiledProgram(Parser("[dec::]@[str::]").parse()))
+        
+        assert "s.startswith(b'@', p0)" in source
+        assert source.count("for ") == 1  # The trailing class needs no loop
+        assert "failed.add(k0)" in source
+    
+    def test_backtracks(self):
+        """Test shorter runs and later alternatives are tried on failure."""
+        run = backtracker_for("[dec::]1[str:`a`|`ab`:]b")
+        
+        assert run(b"1231abx", 0, set()) == 6
+        assert run(b"1231ax", 0, set()) == -1
+        assert backtracker_for("[str::<=3]c")(b"abc!", 0, set()) == 3
+    
+    def test_first_success(self):
+        """Test the first success wins, as in the interpreter."""
+        assert backtracker_for("[str:`ab`|`abc`:]")(b"abc", 0, set()) == 2
+        assert backtracker_for("[x::>=0]")(b"abc", 1, set()) == 3
+    
+    def test_rejected(self):
+        """Test non-latin-1 and deeply nested patterns are left to the interpreter."""
+        assert backtracker_for("€[dec::]") is None
+        assert backtracker_for("[x::>=0]-" * (MAX_CHOICE_POINTS + 1)) is None
+        assert backtracker_for("[x::>=0]-" * MAX_CHOICE_POINTS) is not None
@@ -0,0 +1,78 @@
+"""
+Tests for the SimpleMatch program compiler.
+"""
+
+from matcha.compiler import (
+    CompiledProgram, OP_CLASS, OP_LITERAL, OP_LITERALS, UNBOUNDED, literal_trie
+)
+from matcha.parser import Parser
+
+
+def program_for(pattern: str) -> CompiledProgram:
+    return CompiledProgram(Parser(pattern).parse())
+
+
+class TestCompiledProgram:
+    """Test flattening ASTs into parallel arrays."""
+    
+    def test_operations(self):
+        """Test one operation per AST node."""
+        program = program_for("id-[dec::3][str:`a`|`b`:]")
+        
+        assert len(program) == 3
+        assert list(program.ops) == [OP_LITERAL, OP_CLASS, OP_LITERALS]
+        assert program.literals[0] == "id-"
+        assert program.literals[2] == ["a", "b"]
+    
+    def test_lengths(self):
+        """Test length constraints are stored per operation."""
+        program = program_for("[dec::3][str::>=2]")
+        
+        assert list(program.min_lens) == [3, 2]
+        assert list(program.max_lens) == [3, UNBOUNDED]
+        assert (program.bitmaps[0] >> ord('7')) & 1
+    
+    def test_impossible_lengths(self):
+        """Test bounds no run can meet never look unbounded."""
+        program = program_for("[dec::<0][dec::>=0<0]")
+        
+        assert list(program.min_lens) == [1, 1]
+        assert list(program.max_lens) == [0, 0]
+    
+    def test_accept_tables(self):
+        """Test classes get a latin-1 lookup table and the wildcard none."""
+        program = program_for("[dec::][str:!a-z:][x::]-")
+        
+        assert program.accepts[0][ord('7')] and not program.accepts[0][ord('a')]
+        assert program.accepts[1][0xe9] and not program.accepts[1][ord('q')]
+        assert program.accepts[2] is None
+        assert program.accepts[3] is None
+    
+    def test_byte_literals(self):
+        """Test literals are also kept as latin-1 bytes when they encode."""
+        program = program_for("café[str:`a`|`ü`:]")
+        
+        assert program.latin1
+        assert program.byte_literals == [b"caf\xe9", [b"a", b"\xfc"]]
+        assert not program_for("[dec::]€").latin1
+    
+    def test_single_class(self):
+        """Test detection of programs that are one non-empty class run."""
+        assert program_for("[dec::]").is_single_class()
+        assert program_for("[str::2]").is_single_class()
+        assert not program_for("[dec::>=0]").is_single_class()
+        assert not program_for("[dec::]x").is_single_class()
+        assert not program_for("[str:`a`|`b`:]").is_single_class()
+
+
+class TestLiteralTrie:
+    """Test the trie built over literal alternatives."""
+    
+    def test_shared_prefix(self):
+        """Test alternatives share nodes and record where they end."""
+        trie = literal_trie(["ab", "abc", "b"])
+        
+        assert set(trie) == {ord("a"), ord("b")}
+        assert trie[ord("a")][ord("b")][None] == [0]
+        assert trie[ord("a")][ord("b")][ord("c")][None] == [1]
+        assert trie[ord("b")][None] == [2]
@@ -0,0 +1,124 @@
+"""
+Tests for the SimpleMatch DFA compiler.
+"""
+
+import pytest
+from matcha import _runtime
+from matcha.dfa import DFABuildError, build_dfa, byte_classes, find_first, find_spans, run_dfa
+from matcha.parser import Parser
+
+
+def dfa_for(pattern: str):
+    return build_dfa(Parser(pattern).parse())
+
+
+class TestDFABuild:
+    """Test DFA construction."""
+    
+    def test_fullmatch(self):
+        """Test full-string matching."""
+        dfa = dfa_for("[dec::3]-[dec::4]")
+        
+        assert dfa.fullmatch(b"123-4567")
+        assert not dfa.fullmatch(b"123-456")
+        assert not dfa.fullmatch(b"12a-4567")
+    
+    def test_longest_match(self):
+        """Test that match_at returns the longest match."""
+        dfa = dfa_for("[str::<=3]")
+        
+        assert dfa.match_at(b"abcde", 0) == 3
+        assert dfa.match_at(b"ab1", 0) == 2
+        assert dfa.match_at(b"1ab", 0) == -1
+    
+    def test_negated_class(self):
+        """Test negated classes over latin-1."""
+        dfa = dfa_for("[str:!a-z:]")
+        
+        assert dfa.fullmatch(b"ABC")
+        assert dfa.fullmatch(b"\xe9")
+        assert not dfa.fullmatch(b"aBC")
+    
+    def test_literal_alternatives(self):
+        """Test backtick literal alternatives."""
+        dfa = dfa_for("[str:`black`|`WHITE`:]!")
+        
+        assert dfa.fullmatch(b"black!")
+        assert dfa.fullmatch(b"WHITE!")
+        assert not dfa.fullmatch(b"white!")
+
+
+class TestDFALoops:
+    """Test the search loops shared with the compiled runtime."""
+    
+    def test_run_dfa(self):
+        """Test anchored longest matching."""
+        dfa = dfa_for("[str::]")
+        
+        assert run_dfa(dfa.transitions, dfa.accepts, b"1abc2", 1) == 4
+        assert run_dfa(dfa.transitions, dfa.accepts, b"1abc2", 0) == -1
+    
+    def test_find_first(self):
+        """Test finding the leftmost-longest match."""
+        dfa = dfa_for("[str::]@")
+        
+        assert find_first(dfa.transitions, dfa.accepts, b"1 ab@ c@") == (2, 5)
+        assert find_first(dfa.transitions, dfa.accepts, b"1 ab c") == (-1, -1)
+    
+    def test_find_spans(self):
+        """Test bounded searches, which may end past the range."""
+        dfa = dfa_for("[str::]@")
+        data = b"1 ab@ c@ d@"
+        
+        assert find_spans(dfa.transitions, dfa.accepts, data, 0, 7) == [(2, 5), (6, 8)]
+        assert find_spans(dfa.transitions, dfa.accepts, data, 3, 6) == [(3, 5)]
+        assert find_spans(dfa.transitions, dfa.accepts, data, 0, 11, 1) == [(2, 5)]
+        assert find_spans(dfa.transitions, dfa.accepts, data, 5, 5) == []
+    
+    def test_compiled_loops_agree(self):
+        """Test the compiled loops give the same results as the references."""
+        loops = _runtime.load()
+        if loops is None:
+            pytest.skip("no compiled loops available")
+        dfa = dfa_for("[str::]@")
+        table, accepts = loops.arrays(dfa)
+        data = b"1 ab@ c@ d"
+        
+        assert loops.run_dfa(table, accepts, data, 2) == 5
+        assert loops.find_first(table, accepts, data) == (2, 5)
+        assert loops.find_all_spans(table, accepts, data) == [(2, 5), (6, 8)]
+        assert loops.find_spans(table, accepts, data, 3, 7) == [(3, 5), (6, 8)]
+        assert loops.find_spans(table, accepts, data, 0, 10, 1) == [(2, 5)]
+
+
+class TestDFAErrors:
+    """Test patterns the DFA cannot handle."""
+    
+    def test_non_latin1_literal(self):
+        """Test error on characters outside latin-1."""
+        with pytest.raises(DFABuildError):
+            dfa_for("€[dec::]")
+    
+    def test_state_limit(self):
+        """Test error when the automaton grows too large."""
+        with pytest.raises(DFABuildError):
+            build_dfa(Parser("[x::>=0<=20][dec::<=20]").parse(), max_states=50)
+
+
+class TestByteClasses:
+    """Test the byte partition used by the DFA builder."""
+    
+    def test_partition(self):
+        """Test classes cover every byte once and respect every bitmap."""
+        digits = sum(1 << c for c in b"0123456789")
+        classes = byte_classes([digits, 1 << ord("5"), digits])
+        
+        assert len(classes) == 3
+        assert sum(classes) == (1 << 256) - 1
+        assert 1 << ord("5") in classes
+        assert digits & ~(1 << ord("5")) in classes
+    
+    def test_long_pattern_fails_fast(self):
+        """Test a pattern too large for a DFA is rejected quickly."""
+        with pytest.raises(DFABuildError):
+            dfa_for("[dec::>=0<=1]" * 2000)
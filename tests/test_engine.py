@@ -0,0 +1,89 @@
+"""
+Tests for engine selection.
+"""
+
+import pytest
+from matcha import _numpy_scan, compile
+from matcha.compiler import CompiledProgram
+from matcha.engine import Backend, profile, select
+from matcha.parser import Parser
+
+
+def engine_for(pattern: str) -> str:
+    return compile(pattern).engine.name
+
+
+class TestProfile:
+    """Test the flags the selector reads."""
+    
+    def test_bounded(self):
+        """Test a bounded pattern."""
+        prof = profile(CompiledProgram(Parser("[dec::3]-[dec::<=4]").parse()))
+        
+        assert not prof.has_literals_list
+        assert not prof.has_unbounded_star
+        assert prof.total_max_positions == 8
+    
+    def test_unbounded_with_literals(self):
+        """Test an unbounded pattern with literal alternatives."""
+        prof = profile(CompiledProgram(Parser("[str:`ab`|`abc`:][dec::]").parse()))
+        
+        assert prof.has_literals_list
+        assert prof.has_unbounded_star
+        assert prof.total_max_positions is None
+
+
+class TestSelect:
+    """Test which backend each pattern shape gets."""
+    
+    def test_fixed_length_uses_codegen(self):
+        """Test fixed-length patterns pick generated code."""
+        assert engine_for("[dec::3]-[dec::3]-[dec::4]") == "codegen"
+        assert engine_for("#[hex::6]") == "codegen"
+    
+    def test_unmatchable_fixed_length_uses_shift_or(self):
+        """Test fixed-length patterns the generator declines pick Shift-Or."""
+        assert engine_for("[dec::2]€") == "shift-or"
+    
+    def test_variable_length_uses_dfa(self):
+        """Test character-class patterns pick the DFA."""
+        assert engine_for("[anum:a-zA-Z0-9._%+-:]@[anum:a-zA-Z0-9.-:]") == "dfa"
+        assert engine_for("[dec::]px") == "dfa"
+    
+    def test_single_class_uses_numpy(self):
+        """Test a lone character class picks NumPy scanning when available."""
+        expected = "numpy" if _numpy_scan.available() else "dfa"
+        
+        assert engine_for("[dec::]") == expected
+        assert engine_for("[dec::>=0]") == "dfa"  # May match empty
+    
+    def test_literal_alternatives_use_backtracking(self):
+        """Test literal alternatives keep their written order."""
+        assert engine_for("[str:`ab`|`abc`:]") == "backtrack"
+        assert compile("[str:`ab`|`abc`:]").find("abc") == "ab"
+    
+    def test_large_dfa_uses_backtracking(self):
+        """Test patterns with too many DFA states fall back to backtracking."""
+        assert engine_for("[x::>=0<=40][dec::<=40][x::>=0<=40]") == "backtrack"
+    
+    def test_hot_selection_is_stable_without_toolchain(self):
+        """Test hot re-selection always returns a working backend."""
+        pattern = compile("[dec::]")
+        
+        assert select(pattern, hot=True).find_all_spans(b"a12b3") == [(1, 3), (4, 5)]
+
+
+class TestBackend:
+    """Test the backend interface."""
+    
+    def test_incomplete_backend_cannot_be_constructed(self):
+        """Test a backend missing an operation fails when it is created."""
+        class NoFind(Backend):
+            def fullmatch(self, data):
+                return False
+            
+            def find_all_spans(self, data):
+                return []
+        
+        with pytest.raises(TypeError):
+            NoFind()
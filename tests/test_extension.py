@@ -0,0 +1,73 @@
+"""
+Tests for the Cython DFA extension (matcha._dfa).
+
+The extension is built from source into a temporary directory, so its
+loops are checked even where the working copy was never built.
+"""
+
+import glob
+import importlib.util
+import os
+import subprocess
+import sys
+import pytest
+from matcha import dfa as reference
+from matcha.dfa import build_dfa
+from matcha.parser import Parser
+
+pytest.importorskip("Cython")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PATTERNS = ["[str::]@", "[dec::3]-[dec::4]", "ab[dec::]", "[dec::>=0]", "[hex::<=2]"]
+
+TEXTS = [b"", b"1 ab@ c@ d@", b"555-1234 and 12-3456", b"xab12ab ab3", b"ff0a-9e"]
+
+
+@pytest.fixture(scope="module")
+def ext(tmp_path_factory):
+    build = tmp_path_factory.mktemp("build")
+    result = subprocess.run(
+        [sys.executable, "setup.py", "-q", "build_ext",
+         "--build-lib", str(build), "--build-temp", str(build / "tmp")],
+        cwd=ROOT, capture_output=True,
+    )
+    paths = glob.glob(str(build / "matcha" / "_dfa.*"))
+    if result.returncode != 0 or not paths:
+        pytest.skip("C toolchain unavailable")
+
+    spec = importlib.util.spec_from_file_location("matcha._dfa", paths[0])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+class TestLoopsAgree:
+    """Test the extension gives the same results as matcha.dfa."""
+
+    def test_run_dfa(self, ext, pattern):
+        """Test anchored longest matching from every start."""
+        dfa = build_dfa(Parser(pattern).parse())
+        for data in TEXTS:
+            for start in range(len(data) + 1):
+                assert (ext.run_dfa(dfa.transitions, dfa.accepts, data, start)
+                        == reference.run_dfa(dfa.transitions, dfa.accepts, data, start))
+
+    def test_searches(self, ext, pattern):
+        """Test find_first and find_all_spans."""
+        dfa = build_dfa(Parser(pattern).parse())
+        for data in TEXTS:
+            assert (ext.find_first(dfa.transitions, dfa.accepts, data)
+                    == reference.find_first(dfa.transitions, dfa.accepts, data))
+            assert (ext.find_all_spans(dfa.transitions, dfa.accepts, data)
+                    == reference.find_all_spans(dfa.transitions, dfa.accepts, data))
+
+    def test_find_spans(self, ext, pattern):
+        """Test bounded searches, with and without a limit."""
+        dfa = build_dfa(Parser(pattern).parse())
+        for data in TEXTS:
+            for lo, hi in ((0, len(data)), (2, 6), (3, 3), (1, 100)):
+                for limit in (-1, 1):
+                    args = (dfa.transitions, dfa.accepts, data, lo, hi, limit)
+                    assert ext.find_spans(*args) == reference.find_spans(*args)
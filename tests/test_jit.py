@@ -0,0 +1,111 @@
+"""
+Tests for native code generation of hot patterns.
+"""
+
+import os
+import stat
+import pytest
+from matcha import _jit, compile
+from matcha._jit import compile_dfa
+from matcha.dfa import build_dfa
+from matcha.parser import Parser
+
+pytest.importorskip("cffi")
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "jit"
+    monkeypatch.setattr(_jit, "CACHE_DIR", str(path))
+    return path
+
+
+def jit_for(pattern: str):
+    jit = compile_dfa(build_dfa(Parser(pattern).parse()))
+    if jit is None:
+        pytest.skip("C toolchain unavailable")
+    return jit
+
+
+class TestJitMatcher:
+    """Test the native DFA runner."""
+    
+    def test_fullmatch(self):
+        """Test full-string matching."""
+        jit = jit_for("[dec::3]-[dec::4]")
+        
+        assert jit.fullmatch(b"123-4567")
+        assert not jit.fullmatch(b"123-456")
+    
+    def test_find(self):
+        """Test finding the first match."""
+        jit = jit_for("#[hex::6]")
+        
+        assert jit.find(b"color: #ff00aa;") == (7, 14)
+        assert jit.find(b"no color") is None
+    
+    def test_find_all_spans(self):
+        """Test finding all matches, including empty ones."""
+        assert jit_for("[dec::]").find_all_spans(b"a12b345") == [(1, 3), (4, 7)]
+        assert jit_for("[dec::>=0]").find_all_spans(b"a1") == [(0, 0), (1, 2)]
+    
+    def test_find_all_spans_batches(self, monkeypatch):
+        """Test matches spanning several batches are all collected."""
+        monkeypatch.setattr(_jit, "_BATCH", 2)
+        jit = jit_for("[dec::]")
+        
+        assert jit.find_all_spans(b"1a22b3c44") == [(0, 1), (2, 4), (5, 6), (7, 9)]
+        assert jit.find_all_spans(b"1a22") == [(0, 1), (2, 4)]
+
+
+class TestHotPattern:
+    """Test that hot compiled patterns switch to native code."""
+    
+    def test_results_unchanged(self, monkeypatch):
+        """Test results before and after the JIT threshold agree."""
+        monkeypatch.setattr(_jit, "ENABLED", True)
+        monkeypatch.setattr(_jit, "JIT_THRESHOLD", 3)
+        pattern = compile("[anum:a-z0-9.:]@[anum:a-z.:]")
+        text = "mail a@b.io or x.y@z.org"
+        
+        results = [pattern.find_all(text) for _ in range(4)]
+        
+        assert results == [["a@b.io", "x.y@z.org"]] * 4
+        assert pattern.engine.name == "jit"
+    
+    def test_disabled_by_default(self, monkeypatch):
+        """Test patterns stay off native code unless the JIT is enabled."""
+        monkeypatch.setattr(_jit, "ENABLED", False)
+        monkeypatch.setattr(_jit, "JIT_THRESHOLD", 3)
+        pattern = compile("[anum:a-z0-9.:]#[anum:a-z.:]")
+        
+        for _ in range(4):
+            pattern.find_all("a#b")
+        
+        assert pattern.engine.name != "jit"
+
+
+class TestCache:
+    """Test the on-disk module cache."""
+    
+    def test_private_directory(self, cache_dir):
+        """Test the cache directory is created for the current user only."""
+        jit_for("[dec::]x")
+        
+        assert stat.S_IMODE(os.lstat(cache_dir).st_mode) == 0o700
+        assert all(name.startswith("_matcha_jit_") for name in os.listdir(cache_dir))
+    
+    def test_shared_directory_refused(self, cache_dir):
+        """Test nothing is loaded from a directory others can write to."""
+        cache_dir.mkdir(mode=0o700)
+        cache_dir.chmod(0o777)
+        
+        assert compile_dfa(build_dfa(Parser("[dec::]y").parse())) is None
+    
+    def test_pruned(self, cache_dir, monkeypatch):
+        """Test the cache keeps at most CACHE_SIZE modules."""
+        monkeypatch.setattr(_jit, "CACHE_SIZE", 2)
+        for pattern in ("[dec::]a", "[dec::]b", "[dec::]c"):
+            jit_for(pattern)
+        
+        assert len(os.listdir(cache_dir)) == 2
@@ -4,20 +4,43 @@ Tests for the SimpleMatch lexer.
 
 import pytest
 from matcha.lexer import Lexer, LexerError
-from matcha.tokens import TokenType, CharType
+from matcha.tokens import TokenType, CharType, DEFAULT_BITMAPS, bitmap_ranges
+
+
+def in_class(token, char: str) -> bool:
+    """Check if a character is in a pattern token's bitmap."""
+    return bool((token.bitmap >> ord(char)) & 1)
 
 
 class TestLexerBasic:
     """Test basic lexer functionality."""
     
     def test_literal_only(self):
-        """Test tokenizing literal characters."""
+        """Test tokenizing a run of literal characters."""
         lexer = Lexer("hello")
         tokens = list(lexer.tokenize())
         
-        assert len(tokens) == 5
-        assert all(t.token_type == TokenType.LITERAL for t in tokens)
-        assert "".join(t.value for t in tokens) == "hello"
+        assert len(tokens) == 1
+        assert tokens[0].token_type == TokenType.LITERAL_RUN
+        assert tokens[0].value == "hello"
+    
+    def test_tokens_list(self):
+        """Test tokens() returns the same tokens as tokenize()."""
+        tokens = Lexer("id-[dec::3]").tokens()
+        
+        assert isinstance(tokens, list)
+        assert tokens == list(Lexer("id-[dec::3]").tokenize())
+    
+    def test_literal_run_between_patterns(self):
+        """Test literal runs stop at pattern tokens."""
+        lexer = Lexer("http[str:s:>=0<=1]://")
+        tokens = list(lexer.tokenize())
+        
+        assert [t.token_type for t in tokens] == [
+            TokenType.LITERAL_RUN, TokenType.PATTERN, TokenType.LITERAL_RUN
+        ]
+        assert tokens[0].value == "http"
+        assert tokens[2].value == "://"
     
     def test_single_pattern(self):
         """Test tokenizing a single pattern token."""
@@ -68,30 +91,69 @@ class TestLexerRanges:
         lexer = Lexer("[str::]")
         tokens = list(lexer.tokenize())
         
-        char_set = tokens[0].char_set
-        assert 'a' in char_set
-        assert 'Z' in char_set
-        assert '0' not in char_set
+        assert in_class(tokens[0], 'a')
+        assert in_class(tokens[0], 'Z')
+        assert not in_class(tokens[0], '0')
+    
+    def test_default_range_shared(self):
+        """Test default ranges reuse the precomputed bitmap."""
+        tokens = list(Lexer("[dec::][dec::2]").tokenize())
+        
+        assert tokens[0].bitmap is DEFAULT_BITMAPS[CharType.DEC]
+        assert tokens[1].bitmap is DEFAULT_BITMAPS[CharType.DEC]
     
     def test_custom_range(self):
         """Test custom range A-Z."""
         lexer = Lexer("[str:A-Z:]")
         tokens = list(lexer.tokenize())
         
-        char_set = tokens[0].char_set
-        assert 'A' in char_set
-        assert 'Z' in char_set
-        assert 'a' not in char_set
+        assert in_class(tokens[0], 'A')
+        assert in_class(tokens[0], 'Z')
+        assert not in_class(tokens[0], 'a')
+    
+    def test_combined_ranges(self):
+        """Test several ranges in one class."""
+        lexer = Lexer("[anum:a-zA-Z0-9:]")
+        tokens = list(lexer.tokenize())
+        
+        assert tokens[0].bitmap.bit_count() == 62
+        assert in_class(tokens[0], '9')
+        assert not in_class(tokens[0], '_')
     
     def test_alternative_chars(self):
         """Test pipe-separated alternatives."""
         lexer = Lexer("[str:S|s:]")
         tokens = list(lexer.tokenize())
         
-        char_set = tokens[0].char_set
-        assert 'S' in char_set
-        assert 's' in char_set
-        assert len(char_set) == 2
+        assert in_class(tokens[0], 'S')
+        assert in_class(tokens[0], 's')
+        assert tokens[0].bitmap.bit_count() == 2
+    
+    def test_negated_range(self):
+        """Test negation is folded into the bitmap."""
+        lexer = Lexer("[str:!A-Z:]")
+        tokens = list(lexer.tokenize())
+        
+        assert tokens[0].bitmap < 0
+        assert not in_class(tokens[0], 'A')
+        assert in_class(tokens[0], 'a')
+        assert in_class(tokens[0], '€')
+    
+    def test_wildcard_range(self):
+        """Test X type matches any character."""
+        lexer = Lexer("[x::]")
+        tokens = list(lexer.tokenize())
+        
+        assert in_class(tokens[0], '€')
+    
+    def test_bitmap_ranges(self):
+        """Test class bitmaps split into latin-1 byte ranges."""
+        hex_token = Lexer("[hex::]").tokens()[0]
+        negated = Lexer("[str:!a-z:]").tokens()[0]
+        
+        assert bitmap_ranges(hex_token.bitmap) == [(48, 57), (65, 70), (97, 102)]
+        assert bitmap_ranges(negated.bitmap) == [(0, 96), (123, 255)]
+        assert bitmap_ranges(DEFAULT_BITMAPS[CharType.X]) == [(0, 255)]
 
 
 class TestLexerLength:
@@ -148,6 +210,12 @@ class TestLexerLength:
         length = tokens[0].length
         assert length.min_len == 1
         assert length.max_len == 5
+    
+    def test_length_shared(self):
+        """Test repeated length strings reuse one constraint."""
+        tokens = list(Lexer("[dec::>=2][str::>=2]").tokenize())
+        
+        assert tokens[0].length is tokens[1].length
 
 
 class TestLexerEscape:
@@ -158,9 +226,10 @@ class TestLexerEscape:
         lexer = Lexer("\\[test\\]")
         tokens = list(lexer.tokenize())
         
-        assert len(tokens) == 6
+        assert len(tokens) == 3
         assert tokens[0].value == "["
-        assert tokens[5].value == "]"
+        assert tokens[1].value == "test"
+        assert tokens[2].value == "]"
 
 
 class TestLexerErrors:
@@ -192,3 +261,18 @@ class TestLexerErrors:
             list(lexer.tokenize())
         
         assert "format" in str(exc.value).lower()
+    
+    def test_invalid_length(self):
+        """Test error on malformed length constraints."""
+        for pattern in ("[str::>=]", "[str::5>3]", "[str::>=2x]"):
+            with pytest.raises(LexerError):
+                list(Lexer(pattern).tokenize())
+    
+    def test_too_many_colons(self):
+        """Test error on extra colons."""
+        lexer = Lexer("[str:a:b:]")
+        
+        with pytest.raises(LexerError) as exc:
+            list(lexer.tokenize())
+        
+        assert "[str:a:b:]" in str(exc.value)
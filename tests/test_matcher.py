@@ -3,7 +3,10 @@ Tests for the SimpleMatch matcher.
 """
 
 import pytest
-from matcha import match, find, find_all
+from matcha import match, find, find_all, compile, purge
+from matcha import _runtime, dfa as dfa_module, lexer, matcher as matcher_module
+from matcha.matcher import Matcher
+from matcha.parser import Parser
 
 
 class TestMatchBasic:
@@ -192,6 +195,20 @@ class TestEdgeCases:
     def test_escaped_brackets(self):
         """Test escaped brackets."""
         assert match("\\[test\\]", "[test]")
+    
+    def test_impossible_lengths(self):
+        """Test maximums below the minimum never match, on any engine."""
+        assert not match("[dec::<1]x€", "1x€")
+        assert not match("[dec::<0]€", "1€")
+        assert not match("[dec::<0]", "1")
+        assert find_all("[dec::<0]", "12 3") == []
+    
+    def test_results_have_slots(self):
+        """Test match results and AST nodes carry no per-instance dict."""
+        result = Matcher(Parser("[dec::]").parse()).find_first("a1")
+        
+        assert not hasattr(result, "__dict__")
+        assert not any(hasattr(node, "__dict__") for node in Parser("a[dec::]").parse())
 
 
 class TestBacktracking:
@@ -212,3 +229,163 @@ class TestBacktracking:
         assert match(pattern, "abc123def")
         assert match(pattern, "a1b")
         assert not match(pattern, "abc")  # No number
+    
+    def test_long_pattern_no_recursion_limit(self):
+        """Test patterns longer than the recursion limit still match."""
+        matcher = Matcher(Parser("[dec::>=0<=1]" * 2000).parse())
+        
+        assert matcher.match_full("1" * 1500)
+        assert not matcher.match_full("1" * 2001)
+    
+    def test_no_catastrophic_backtracking(self):
+        """Test failing states are remembered instead of re-explored."""
+        matcher = Matcher(Parser("[str::]" * 6 + "@").parse())
+        
+        assert matcher.find_first("a" * 200 + "b") is None
+        assert [r.value for r in matcher.find_all("abcdefg@ xyz")] == ["abcdefg@"]
+    
+    def test_prefilter_candidates(self):
+        """Test searches only try starts where the mandatory prefix matches."""
+        matcher = Matcher(Parser("[dec::2]-[str::]").parse())
+        
+        assert list(matcher._candidates("a12-b 34-c 5")) == [1, 6]
+        assert [r.value for r in matcher.find_all("a12-b 34-")] == ["12-b"]
+        assert matcher.find_first("x€12-ab").value == "12-ab"
+    
+    def test_vectorized_prefilter(self):
+        """Test the NumPy prefilter finds the same starts as Shift-Or."""
+        matcher = Matcher(Parser("[dec::2]-[str::]").parse())
+        text = "a12-b 34-c 5-d 67-" * 8
+        starts = list(matcher._candidates(text.encode("latin-1")))
+        
+        matcher._kick_tables = None  # Fall back to Shift-Or
+        assert list(matcher._candidates(text.encode("latin-1"))) == starts
+        assert starts[:3] == [1, 6, 15]
+    
+    def test_literal_prefix_candidates(self):
+        """Test searches jump between occurrences of a literal prefix."""
+        matcher = Matcher(Parser("ab[dec::]").parse())
+        
+        assert list(matcher._candidates("xabab1 ab2")) == [1, 3, 7]
+        assert [r.value for r in matcher.find_all("xabab1 ab2")] == ["ab1", "ab2"]
+        assert matcher.find_first("abx ab12").start == 4
+    
+    def test_find_all_parallel(self, monkeypatch):
+        """Test chunked searches agree with find_all across chunk boundaries."""
+        monkeypatch.setattr(matcher_module, "_PARALLEL_MIN_LENGTH", 0)
+        loops = _runtime.load()
+        if loops is None:
+            # Exercise the merge with the reference loops
+            reference = _runtime.Loops(
+                "python", lambda dfa: (dfa.transitions, dfa.accepts), dfa_module.run_dfa,
+                dfa_module.find_first, dfa_module.find_all_spans, dfa_module.find_spans,
+            )
+            monkeypatch.setattr(_runtime, "load", lambda: reference)
+        text = "ab12 a1 aab123b ab 1ab12ab"
+        
+        for pattern in ("ab[dec::]", "[str::>=0][dec::<=2]", "[str:`a`|`ab`:][dec::]"):
+            matcher = Matcher(Parser(pattern).parse())
+            expected = [(r.start, r.end) for r in matcher.find_all(text)]
+            for chunk in (1, 3, 5):
+                found = matcher.find_all_parallel(text, chunk=chunk, workers=2)
+                assert [(r.start, r.end) for r in found] == expected
+    
+    def test_spans(self):
+        """Test span searches agree with the MatchResult ones."""
+        matcher = Matcher(Parser("[str::]=[dec::]").parse())
+        text = "a=1, bb=22, =3"
+        
+        assert matcher.find_all_spans(text) == [(0, 3), (5, 10)]
+        assert matcher.find_span(text) == (0, 3)
+        assert matcher.find_span("a=") is None
+    
+    def test_single_class_find_all(self):
+        """Test single class runs give the same results with or without NumPy."""
+        matcher = Matcher(Parser("[dec::<=3]").parse())
+        text = "a12345b6é78"
+        expected = [("123", 1), ("45", 4), ("6", 7), ("78", 9)]
+        
+        assert [(r.value, r.start) for r in matcher.find_all(text)] == expected
+        matcher._class_table = None
+        assert [(r.value, r.start) for r in matcher.find_all(text)] == expected
+    
+    def test_literal_alternatives(self):
+        """Test literal alternatives are tried in written order, then backtrack."""
+        assert find("[str:`ab`|`abc`:]", "abc") == "ab"
+        assert match("[str:`abc`|`ab`:]c", "abc")  # Backtracks to "ab"
+        assert match("[str:`black`|`blue`|`bl`:]!", "blue!")
+        assert not match("[str:`black`|`blue`:]", "blu")
+
+
+class TestCompile:
+    """Test compiled patterns."""
+    
+    def test_compile_methods(self):
+        """Test match/find/find_all on a compiled pattern."""
+        pattern = compile("[dec::]")
+        
+        assert pattern.match("123")
+        assert pattern.find("abc123def") == "123"
+        assert pattern.find_all("abc123def456") == ["123", "456"]
+    
+    def test_compile_is_cached(self):
+        """Test that compiling the same pattern reuses the cached object."""
+        assert compile("[str::]@[str::]") is compile("[str::]@[str::]")
+    
+    def test_purge(self):
+        """Test that purge clears the compiled pattern cache."""
+        pattern = compile("[hex::]")
+        purge()
+        
+        assert compile("[hex::]") is not pattern
+    
+    def test_purge_clears_lexer_caches(self):
+        """Test that purge also empties the lexer's parse caches."""
+        compile("[dec::>=3]")
+        purge()
+        
+        assert lexer._parse_length.cache_info().currsize == 0
+        assert lexer._parse_range.cache_info().currsize == 0
+    
+    def test_literal_prefix(self):
+        """Test the literal prefix used to skip ahead in find/find_all."""
+        pattern = compile("http[str:s:>=0<=1]://[anum:a-z.:]")
+        
+        assert pattern.prefix == "http"
+        assert pattern.find("see http://a.io") == "http://a.io"
+        assert pattern.find_all("http://a.io https://b.org httpx") == [
+            "http://a.io", "https://b.org"
+        ]
+        assert compile("[dec::]").prefix == ""
+    
+    def test_non_latin1_fallback(self):
+        """Test patterns and text outside latin-1 still match."""
+        assert match("[x::]€", "a€")
+        assert find_all("[str:!A-Z:]", "ABC€uro") == ["€uro"]
+    
+    def test_dfa_built_once(self):
+        """Test the Matcher builds its DFA once and shares it with the engine."""
+        pattern = compile("[str::]@[str::]")
+        
+        assert pattern.matcher.dfa is pattern.matcher.dfa
+        assert pattern.engine.dfa is pattern.matcher.dfa
+    
+    def test_latin1_text(self):
+        """Test latin-1 text runs on the selected engine with str offsets."""
+        pattern = compile("[dec::]")
+        
+        assert pattern.find_all("é12ü3") == ["12", "3"]
+        assert pattern.find("ñ7") == "7"
+    
+    def test_backtracker_subjects(self):
+        """Test the backtracker gives str offsets over bytes and str alike."""
+        matcher = Matcher(Parser("[str:`é`|`ab`:][dec::]").parse())
+        
+        assert [r.value for r in matcher.find_all("xé1 ab2 €é3")] == ["é1", "ab2", "é3"]
+        assert matcher.find_first("€ab12").start == 1
+        assert Matcher(Parser("€[dec::]").parse()).find_first("é€12").value == "€12"
+    
+    def test_adjacent_unbounded_patterns(self):
+        """Test that adjacent unbounded patterns do not interleave."""
+        assert not match("[str:!1-9:][dec::>=0]", "ab1cd")
+        assert match("[str:!1-9:][dec::>=0]", "ab12")
@@ -0,0 +1,53 @@
+"""
+Tests for NumPy scanning of single character-class patterns.
+"""
+
+import pytest
+from matcha import _numpy_scan as scan
+from matcha.compiler import UNBOUNDED
+from matcha.tokens import CharType, DEFAULT_BITMAPS
+
+pytest.importorskip("numpy")
+
+DIGITS = DEFAULT_BITMAPS[CharType.DEC]
+
+
+class TestFindAllClass:
+    """Test finding runs of one class."""
+    
+    def test_unbounded(self):
+        """Test whole runs are returned, filtered by minimum length."""
+        table = scan.class_table(DIGITS)
+        
+        assert scan.find_all_class(table, b"a1b22c333", 1, UNBOUNDED) == [(1, 2), (3, 5), (6, 9)]
+        assert scan.find_all_class(table, b"a1b22c333", 2, UNBOUNDED) == [(3, 5), (6, 9)]
+        assert scan.find_all_class(table, b"", 1, UNBOUNDED) == []
+    
+    def test_bounded_runs_split(self):
+        """Test long runs split into maximum-length pieces."""
+        table = scan.class_table(DIGITS)
+        
+        assert scan.find_all_class(table, b"12345", 2, 2) == [(0, 2), (2, 4)]
+        assert scan.find_all_class(table, b"1234567", 2, 3) == [(0, 3), (3, 6)]
+    
+    def test_find_class(self):
+        """Test finding the first long enough run."""
+        table = scan.class_table(DIGITS)
+        
+        assert scan.find_class(table, b"a1b234", 2, UNBOUNDED) == (3, 6)
+        assert scan.find_class(table, b"a1b234", 2, 2) == (3, 5)
+        assert scan.find_class(table, b"abc", 1, UNBOUNDED) is None
+
+
+class TestPrefixStarts:
+    """Test the vectorized search-start prefilter."""
+    
+    def test_prefix_positions(self):
+        """Test every position of the prefix must be in its class."""
+        digit = scan.class_table(DIGITS)
+        dash = scan.class_table(1 << ord("-"))
+        data = b"1-2 34-5-"
+        
+        assert scan.prefix_starts([digit, dash], data, 0, len(data)) == [0, 5, 7]
+        assert scan.prefix_starts([digit, dash], data, 1, 6) == [5]
+        assert scan.prefix_starts([digit, dash], data, 8, 9) == []
@@ -0,0 +1,71 @@
+"""
+Tests for the bit-parallel fixed-length matcher.
+"""
+
+from matcha.compiler import CompiledProgram
+from matcha.parser import Parser
+from matcha.shift_or import build_shift_or, prefix_bitmaps
+
+
+def shift_or_for(pattern: str):
+    return build_shift_or(CompiledProgram(Parser(pattern).parse()))
+
+
+class TestShiftOrBuild:
+    """Test which patterns qualify."""
+    
+    def test_fixed_length(self):
+        """Test fixed-length patterns are accepted."""
+        assert shift_or_for("[dec::3]-[dec::3]-[dec::4]").length == 12
+        assert shift_or_for("#[hex::6]").length == 7
+    
+    def test_variable_length(self):
+        """Test variable-length and oversized patterns are rejected."""
+        assert shift_or_for("[dec::]") is None
+        assert shift_or_for("[str::>=2<=4]") is None
+        assert shift_or_for("[str:`ab`|`cd`:]") is None
+        assert shift_or_for("[x::65]") is None
+        assert shift_or_for("") is None
+
+
+class TestShiftOrMatch:
+    """Test matching with Shift-Or."""
+    
+    def test_fullmatch(self):
+        """Test full-string matching."""
+        matcher = shift_or_for("#[hex::6]")
+        
+        assert matcher.fullmatch(b"#ff00aa")
+        assert not matcher.fullmatch(b"#ff00a")
+        assert not matcher.fullmatch(b"#ff00ag")
+    
+    def test_find(self):
+        """Test finding the first match."""
+        matcher = shift_or_for("[dec::3]-[dec::4]")
+        
+        assert matcher.find(b"tel 555-1234 or 555-9876") == (4, 12)
+        assert matcher.find(b"none") is None
+    
+    def test_find_all_non_overlapping(self):
+        """Test matches do not overlap."""
+        matcher = shift_or_for("[dec::2]")
+        
+        assert matcher.find_all_spans(b"12345") == [(0, 2), (2, 4)]
+
+
+class TestPrefixBitmaps:
+    """Test the mandatory prefix used to prefilter backtracking searches."""
+    
+    def test_prefix(self):
+        """Test the prefix stops after the first variable-length class."""
+        program = CompiledProgram(Parser("a[dec::2][str::>=2]@").parse())
+        positions = prefix_bitmaps(program)
+        
+        assert len(positions) == 5
+        assert positions[0] == 1 << ord('a')
+        assert positions[1] == positions[2] == program.bitmaps[1]
+    
+    def test_empty_prefix(self):
+        """Test patterns that may start with anything have no prefix."""
+        assert prefix_bitmaps(CompiledProgram(Parser("[str::>=0]a").parse())) == []
+        assert prefix_bitmaps(CompiledProgram(Parser("[str:`a`|`b`:]").parse())) == []